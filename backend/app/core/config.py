@@ -10,5 +10,42 @@ class Settings(BaseSettings):
     # Dev helpers
     SKIP_AUTH: bool = False
     DEV_ASSUME_TESTER_ID: int | None = None
+    # Startup (see app/core/startup.py)
+    SCHEMA_CHECK_ON_STARTUP: bool = True   # run create_all in the lifespan; off once on Alembic
+    DB_STARTUP_RETRIES: int = 8
+    DB_STARTUP_BACKOFF: float = 0.5        # seconds, doubled per attempt
+    DB_STARTUP_BACKOFF_MAX: float = 8.0
+    WARMUP_ON_STARTUP: bool = False        # import export libs + open a connection before serving
+    # Serving profile (see gunicorn.conf.py and app/core/serving.py)
+    WEB_BIND: str = "0.0.0.0:8000"
+    WEB_WORKERS: int = 0                   # 0 = (2 x cores) + 1, capped at WEB_WORKERS_MAX
+    WEB_WORKERS_MAX: int = 8
+    WEB_TIMEOUT: int = 60                  # kill a worker stuck this long on one request
+    WEB_KEEPALIVE: int = 5
+    WEB_MAX_REQUESTS: int = 2000           # recycle workers to bound memory growth
+    WEB_MAX_REQUESTS_JITTER: int = 200
+    GRACEFUL_TIMEOUT: int = 30             # seconds from SIGTERM until gunicorn kills the worker
+    DRAIN_DELAY: float = 0                 # keep serving (with /health 503) this long after SIGTERM
+    INSTANCE_COUNT: int = 1                # containers sharing the database
+    DB_MAX_CONNECTIONS: int = 100          # Postgres max_connections (infra/docker-compose.yml)
+    DB_RESERVED_CONNECTIONS: int = 10      # kept free for superuser, pgAdmin, migrations
+    DB_POOL_SIZE: int | None = None        # explicit override of the derived budget
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_PRE_PING: bool = True
+    UPLOADS_DIR: str | None = None         # shared volume for PoCs/reports; default backend/uploads
+    METRICS_DIR: str | None = None         # shared dir so /metrics aggregates all workers
+    # Retention / cold storage (see app/services/archive_service.py)
+    ARCHIVE_DIR: str | None = None             # default backend/archive
+    REPORTS_KEEP_HOT: int = 5                  # latest N reports per project stay in `reports`
+    ARCHIVE_ON_WRITE: bool = True              # trim a project's reports after each (re)generate
+    ARCHIVE_PROJECT_STATUSES: List[str] = ["Completed", "Closed"]
+    ARCHIVE_PROJECTS_AFTER_DAYS: int = 180     # findings of finished projects older than this move
+    # Monthly partitioning of findings/reports (see app/core/partitioning.py)
+    PARTITIONING_ENABLED: bool = False
+    PARTITION_MONTHS_AHEAD: int = 3
+    # Instrumentation (/metrics)
+    METRICS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    N_PLUS_ONE_THRESHOLD: int = 10   # same statement this many times in one request
 
 settings = Settings()
@@ -1,6 +1,12 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import install_db_hooks
+from app.core.serving import db_pool_budget
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# Pool is per process: sized so every worker in every instance fits in max_connections
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=settings.DB_POOL_PRE_PING, **db_pool_budget())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+if settings.METRICS_ENABLED:
+    install_db_hooks(engine)
@@ -0,0 +1,98 @@
+# backend/app/core/draining.py
+"""
+Tracks in-flight report jobs and uploads so a worker can drain on shutdown.
+
+Report rendering runs in the threadpool and keeps going even if the server
+cancels the request task, so the lifespan waits here before disposing the
+DB pool. Draining starts when the process receives SIGTERM (the lifespan
+chains a handler onto the server's, see install_signal_handlers): from then
+on new jobs get 503 + Retry-After and /health reports not-ready so the load
+balancer stops routing to this worker.
+"""
+import logging
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+log = logging.getLogger("app.draining")
+
+# Seconds of graceful_timeout left for disposing the pool and exiting
+SHUTDOWN_MARGIN = 2
+
+
+class InFlight:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._active: Dict[str, int] = {}
+        self.draining = False
+        self._since: Optional[float] = None
+
+    @contextmanager
+    def track(self, kind: str):
+        with self._cond:
+            if self.draining:
+                raise HTTPException(status_code=503, detail="Server is shutting down",
+                                    headers={"Retry-After": "5"})
+            self._active[kind] = self._active.get(kind, 0) + 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active[kind] -= 1
+                self._cond.notify_all()
+
+    def active(self) -> Dict[str, int]:
+        with self._cond:
+            return {k: v for k, v in self._active.items() if v}
+
+    def start_draining(self):
+        """Refuse new work from now on. Safe to call from a signal handler."""
+        if self._since is None:
+            self._since = time.monotonic()
+        self.draining = True
+
+    def install_signal_handlers(self, delay: float = 0):
+        """Start draining on SIGTERM/SIGINT, then hand the signal to the server after `delay` s.
+
+        Call from the lifespan startup: uvicorn has installed its own handlers by then and
+        closes its sockets as soon as they run, so the delay is what lets /health report
+        503 to the load balancer while the worker still answers.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                continue
+
+            def handler(signum, frame, previous=previous):
+                first = not self.draining
+                self.start_draining()
+                if first and delay > 0:
+                    timer = threading.Timer(delay, previous, (signum, frame))
+                    timer.daemon = True
+                    timer.start()
+                else:
+                    previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+    def drain(self, timeout: float) -> bool:
+        """Wait until `timeout` seconds after draining started; True if everything finished."""
+        self.start_draining()
+        deadline = self._since + timeout
+        with self._cond:
+            while any(self._active.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log.warning("drain timed out with jobs still running: %s", self.active())
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+
+inflight = InFlight()
@@ -0,0 +1,376 @@
+# backend/app/core/metrics.py
+"""
+Request-level instrumentation:
+- per-route latency histograms (HTTP middleware)
+- per-request query count, DB time and rows (SQLAlchemy event hooks)
+- slow-query logging and simple N+1 detection
+- Prometheus text exposition for GET /metrics
+
+Each worker process keeps its own registry. With several workers set
+METRICS_DIR to a shared directory: every worker flushes a JSON snapshot there
+and /metrics renders the sum, whichever worker answers the scrape. When a
+worker exits, gunicorn folds its snapshot into one aggregate file
+(mark_process_dead), so the directory stays small as workers are recycled.
+"""
+import json
+import logging
+import os
+import re
+import reprlib
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.core.config import settings
+
+log = logging.getLogger("app.metrics")
+
+# Seconds. Roughly the Prometheus client defaults.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestStats:
+    """DB activity collected while serving a single request."""
+
+    __slots__ = ("queries", "db_time", "rows", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.statements: Counter = Counter()
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Registry:
+    """Tiny in-process metric store; one instance per worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self.queries: Dict[Tuple[str, str], _Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+        self.db_rows: Dict[Tuple[str, str], int] = {}
+        self.slow_queries = 0
+        self.n_plus_one: Dict[Tuple[str, str], int] = {}
+        self.pool_checkouts = 0
+
+    def record_request(self, method: str, route: str, status: int, elapsed: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            h = self.latency.get((method, route, str(status)))
+            if h is None:
+                h = self.latency[(method, route, str(status))] = _Histogram(LATENCY_BUCKETS)
+            h.observe(elapsed)
+
+            q = self.queries.get(key)
+            if q is None:
+                q = self.queries[key] = _Histogram(QUERY_COUNT_BUCKETS)
+            q.observe(stats.queries)
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + stats.db_time
+            self.db_rows[key] = self.db_rows.get(key, 0) + stats.rows
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def record_n_plus_one(self, method: str, route: str):
+        with self._lock:
+            self.n_plus_one[(method, route)] = self.n_plus_one.get((method, route), 0) + 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.pool_checkouts += 1
+
+    def reset(self):
+        self.__init__()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "latency": [[*k, list(h.counts), h.sum, h.count] for k, h in self.latency.items()],
+                "queries": [[*k, list(h.counts), h.sum, h.count] for k, h in self.queries.items()],
+                "db_seconds": [[*k, v] for k, v in self.db_seconds.items()],
+                "db_rows": [[*k, v] for k, v in self.db_rows.items()],
+                "n_plus_one": [[*k, v] for k, v in self.n_plus_one.items()],
+                "slow_queries": self.slow_queries,
+                "pool_checkouts": self.pool_checkouts,
+            }
+
+    def merge(self, snap: dict):
+        def add_hist(store, key, buckets, counts, total, count):
+            h = store.get(key)
+            if h is None:
+                h = store[key] = _Histogram(buckets)
+            h.counts = [a + b for a, b in zip(h.counts, counts)]
+            h.sum += total
+            h.count += count
+
+        with self._lock:
+            for m, r, st, counts, total, count in snap["latency"]:
+                add_hist(self.latency, (m, r, st), LATENCY_BUCKETS, counts, total, count)
+            for m, r, counts, total, count in snap["queries"]:
+                add_hist(self.queries, (m, r), QUERY_COUNT_BUCKETS, counts, total, count)
+            for name in ("db_seconds", "db_rows", "n_plus_one"):
+                store = getattr(self, name)
+                for m, r, v in snap[name]:
+                    store[(m, r)] = store.get((m, r), 0) + v
+            self.slow_queries += snap["slow_queries"]
+            self.pool_checkouts += snap["pool_checkouts"]
+
+    def render(self) -> str:
+        out: List[str] = []
+        with self._lock:
+            out.append("# HELP http_request_duration_seconds Request latency by route.")
+            out.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route, status), h in sorted(self.latency.items()):
+                labels = f'method="{method}",route="{_esc(route)}",status="{status}"'
+                _render_histogram(out, "http_request_duration_seconds", labels, h)
+
+            out.append("# HELP db_queries_per_request Number of SQL statements per request.")
+            out.append("# TYPE db_queries_per_request histogram")
+            for (method, route), h in sorted(self.queries.items()):
+                labels = f'method="{method}",route="{_esc(route)}"'
+                _render_histogram(out, "db_queries_per_request", labels, h)
+
+            out.append("# HELP db_query_seconds_total Time spent executing SQL, by route.")
+            out.append("# TYPE db_query_seconds_total counter")
+            for (method, route), v in sorted(self.db_seconds.items()):
+                out.append(f'db_query_seconds_total{{method="{method}",route="{_esc(route)}"}} {v:.6f}')
+
+            out.append("# HELP db_rows_total Rows returned or affected by SQL, by route.")
+            out.append("# TYPE db_rows_total counter")
+            for (method, route), v in sorted(self.db_rows.items()):
+                out.append(f'db_rows_total{{method="{method}",route="{_esc(route)}"}} {v}')
+
+            out.append("# HELP db_slow_queries_total Statements slower than SLOW_QUERY_MS.")
+            out.append("# TYPE db_slow_queries_total counter")
+            out.append(f"db_slow_queries_total {self.slow_queries}")
+
+            out.append("# HELP db_n_plus_one_total Requests that repeated one statement N_PLUS_ONE_THRESHOLD+ times.")
+            out.append("# TYPE db_n_plus_one_total counter")
+            for (method, route), v in sorted(self.n_plus_one.items()):
+                out.append(f'db_n_plus_one_total{{method="{method}",route="{_esc(route)}"}} {v}')
+
+            out.append("# HELP db_pool_checkouts_total Connection checkouts (each one pays a pre-ping).")
+            out.append("# TYPE db_pool_checkouts_total counter")
+            out.append(f"db_pool_checkouts_total {self.pool_checkouts}")
+        return "\n".join(out) + "\n"
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(out: List[str], name: str, labels: str, h: _Histogram):
+    cumulative = 0
+    for bound, n in zip(h.buckets, h.counts):
+        cumulative += n
+        out.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    out.append(f'{name}_bucket{{{labels},le="+Inf"}} {h.count}')
+    out.append(f"{name}_sum{{{labels}}} {h.sum:.6f}")
+    out.append(f"{name}_count{{{labels}}} {h.count}")
+
+
+registry = _Registry()
+
+
+# --- multi-worker aggregation ---
+
+def flush_shared():
+    """Write this worker's snapshot into METRICS_DIR (no-op when unset)."""
+    if not settings.METRICS_DIR:
+        return
+    d = Path(settings.METRICS_DIR)
+    d.mkdir(parents=True, exist_ok=True)
+    tmp = d / f".{os.getpid()}.json.tmp"
+    tmp.write_text(json.dumps(registry.snapshot()))
+    os.replace(tmp, d / f"{os.getpid()}.json")
+
+
+AGGREGATE_FILE = "aggregate.json"
+
+
+def _load_snapshot(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        log.warning("skipping unreadable metrics snapshot %s", path)
+        return None
+
+
+def mark_process_dead(pid: int):
+    """Fold an exited worker's snapshot into the aggregate file (gunicorn child_exit hook)."""
+    if not settings.METRICS_DIR:
+        return
+    d = Path(settings.METRICS_DIR)
+    snap = _load_snapshot(d / f"{pid}.json")
+    if snap is None:
+        return
+    total = _Registry()
+    aggregate = _load_snapshot(d / AGGREGATE_FILE)
+    if aggregate is not None:
+        total.merge(aggregate)
+    total.merge(snap)
+    tmp = d / f".{AGGREGATE_FILE}.tmp"
+    tmp.write_text(json.dumps(total.snapshot()))
+    # Replace first, then drop the worker file: a scrape in between double-counts
+    # for an instant rather than losing the worker's totals
+    os.replace(tmp, d / AGGREGATE_FILE)
+    (d / f"{pid}.json").unlink(missing_ok=True)
+
+
+def render_all() -> str:
+    if not settings.METRICS_DIR:
+        return registry.render()
+    flush_shared()
+    total = _Registry()
+    # Live workers' snapshots plus the aggregate of exited ones
+    for f in Path(settings.METRICS_DIR).glob("*.json"):
+        snap = _load_snapshot(f)
+        if snap is not None:
+            total.merge(snap)
+    return total.render()
+
+
+def start_flusher(interval: float = 5.0) -> Optional[threading.Event]:
+    """Flush snapshots periodically so workers that never serve a scrape still count."""
+    if not settings.METRICS_DIR:
+        return None
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            flush_shared()
+
+    threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+    return stop
+
+
+# --- SQLAlchemy hooks ---
+
+# Parameters can hold whole finding descriptions; keep slow-query log lines short
+_param_repr = reprlib.Repr()
+_param_repr.maxstring = 80
+_param_repr.maxother = 80
+_param_repr.maxlist = _param_repr.maxtuple = _param_repr.maxdict = 10
+_MAX_STATEMENT_LOG = 2000
+
+
+def _describe_params(parameters, executemany: bool) -> str:
+    if executemany:
+        # One row per parameter set; only the batch size is useful in a log line
+        return f"<executemany: {len(parameters)} parameter sets>"
+    return _param_repr.repr(parameters)
+
+
+_literals = re.compile(r"\b\d+\b|'(?:[^']|'')*'")
+
+
+def _normalize(statement: str) -> str:
+    # Collapse inline literals so "... WHERE id = 1" and "... id = 2" group together
+    return _literals.sub("?", " ".join(statement.split()))
+
+
+def install_db_hooks(engine: Engine):
+    """Attach query/timing listeners to `engine`. Safe to call once per engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+            stats.rows += max(cursor.rowcount, 0)
+            stats.statements[_normalize(statement)] += 1
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            registry.record_slow_query()
+            log.warning("slow query (%.1f ms): %s | params=%s", elapsed * 1000,
+                        statement[:_MAX_STATEMENT_LOG], _describe_params(parameters, executemany))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        # after_cursor_execute doesn't run for a failed statement; don't leave its start
+        # time on the pooled connection
+        if ctx.connection is not None and ctx.execution_context is not None:
+            started = ctx.connection.info.get("query_start")
+            if started:
+                started.pop()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, conn_record, conn_proxy):
+        registry.record_checkout()
+
+
+# --- HTTP middleware ---
+
+def _route_label(request: Request) -> str:
+    # Use the route template (/tester/reports/{report_id}/download) to keep label cardinality bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path == "/metrics":
+            return await call_next(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            method, route = request.method, _route_label(request)
+            registry.record_request(method, route, status, elapsed, stats)
+
+            if stats.statements:
+                statement, n = stats.statements.most_common(1)[0]
+                if n >= settings.N_PLUS_ONE_THRESHOLD:
+                    registry.record_n_plus_one(method, route)
+                    log.warning("possible N+1 on %s %s: %d x %s", method, route, n, statement)
@@ -0,0 +1,248 @@
+# backend/app/core/partitioning.py
+"""
+Postgres declarative partitioning for `findings` and `reports`.
+
+With PARTITIONING_ENABLED both tables are RANGE-partitioned by month on
+created_at (findings_p2026_10, ...) plus a DEFAULT partition for stray rows.
+The ORM models are unchanged: only the physical table differs, with the
+primary key widened to (id, created_at) as Postgres requires.
+
+Per-project findings queries add `created_at >= (SELECT projects.created_at ...)`
+when partitioning is enabled, so the executor skips every month before the
+engagement started (see _project_findings in app/routers/tester.py).
+
+    python -m app.core.partitioning ensure     # create upcoming monthly partitions (cron)
+    python -m app.core.partitioning migrate    # convert existing heap tables in place
+"""
+import argparse
+import datetime
+import logging
+from typing import Optional
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, inspect, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.models.models import Base, Finding, Report, Project, User
+
+log = logging.getLogger("app.partitioning")
+
+PARTITION_KEY = "created_at"
+PARTITIONED_TABLES = {"findings": Finding.__table__, "reports": Report.__table__}
+# Rows keep their ids when archived, so these share the hot table's id space
+ARCHIVE_TABLES = {"findings": "findings_archive", "reports": "reports_archive"}
+
+# Serializes DDL when several workers start at once
+_DDL_LOCK_ID = 360_031
+
+
+def _qualified(name: str, schema: Optional[str]) -> str:
+    return f'"{schema}"."{name}"' if schema else f'"{name}"'
+
+
+def partitioned_table(name: str, schema: Optional[str] = None) -> Table:
+    """Copy of the model table with PK (id, created_at) and PARTITION BY RANGE (created_at)."""
+    md = MetaData()
+    # Referenced tables must be in the same MetaData for the foreign keys to compile
+    User.__table__.to_metadata(md, schema=schema)
+    Project.__table__.to_metadata(md, schema=schema)
+    t = PARTITIONED_TABLES[name].to_metadata(md, schema=schema)
+    t.c.id.autoincrement = True   # composite PKs don't get SERIAL implicitly
+    t.c[PARTITION_KEY].nullable = False
+    t.c[PARTITION_KEY].primary_key = True
+    t.append_constraint(PrimaryKeyConstraint(t.c.id, t.c[PARTITION_KEY], name=f"{name}_pkey"))
+    t.dialect_kwargs["postgresql_partition_by"] = f"RANGE ({PARTITION_KEY})"
+    return t
+
+
+def is_partitioned(conn: Connection, name: str, schema: Optional[str] = None) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relname = :name AND n.nspname = coalesce(:schema, current_schema())"
+    ), {"name": name, "schema": schema}).scalar())
+
+
+def _month_start(d: datetime.date) -> datetime.date:
+    return d.replace(day=1)
+
+
+def _next_month(d: datetime.date) -> datetime.date:
+    return (d.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _move_out_of_default(conn: Connection, name: str, part: str, month: datetime.date,
+                         upper: datetime.date, schema: Optional[str]):
+    """Create `part` for a month whose rows already sit in the DEFAULT partition.
+
+    Postgres refuses to create it while DEFAULT holds matching rows, so DEFAULT is
+    detached, the month's rows are moved into the new partition and DEFAULT is
+    re-attached, all in the caller's transaction (ACCESS EXCLUSIVE on the table).
+    """
+    parent, default = _qualified(name, schema), _qualified(name + "_default", schema)
+    bounds = {"lo": month, "hi": upper}
+    conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {default}"))
+    conn.execute(text(
+        f"CREATE TABLE {part} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+    ))
+    moved = conn.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {PARTITION_KEY} >= :lo AND {PARTITION_KEY} < :hi "
+        f"RETURNING *) INSERT INTO {part} SELECT * FROM moved"
+    ), bounds).rowcount
+    conn.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {default} DEFAULT"))
+    log.info("moved %d row(s) from %s into new partition %s", moved, default, part)
+
+
+def ensure_partitions(conn: Connection, name: str, start: Optional[datetime.date] = None,
+                      months_ahead: Optional[int] = None, schema: Optional[str] = None) -> int:
+    """Create monthly partitions from `start` (default: this month) to N months ahead.
+
+    Rows that already landed in the DEFAULT partition for one of those months are
+    moved into the new partition, so DEFAULT only ever holds out-of-range strays.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _DDL_LOCK_ID})
+    ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    today = datetime.date.today()
+    month = _month_start(start or today)
+    end = _month_start(today)
+    for _ in range(ahead):
+        end = _next_month(end)
+
+    created = 0
+    parent = _qualified(name, schema)
+    default = _qualified(name + "_default", schema)
+    has_default = conn.execute(text("SELECT to_regclass(:p)"), {"p": default}).scalar()
+    while month <= end:
+        upper = _next_month(month)
+        part = _qualified(f"{name}_p{month:%Y_%m}", schema)
+        exists = conn.execute(text("SELECT to_regclass(:p)"), {"p": part}).scalar()
+        if not exists:
+            stray = has_default and conn.execute(text(
+                f"SELECT 1 FROM {default} WHERE {PARTITION_KEY} >= :lo AND {PARTITION_KEY} < :hi LIMIT 1"
+            ), {"lo": month, "hi": upper}).scalar()
+            if stray:
+                _move_out_of_default(conn, name, part, month, upper, schema)
+            else:
+                conn.execute(text(
+                    f"CREATE TABLE {part} PARTITION OF {parent} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                ))
+            created += 1
+        month = upper
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {parent} DEFAULT"))
+    return created
+
+
+# Naive UTC, matching the ORM's datetime.utcnow defaults
+_UTC_NOW = "timezone('utc', now())"
+
+
+def ensure_columns(conn: Connection, schema: Optional[str] = None):
+    """Add created_at columns that create_all can't add to existing tables."""
+    insp = inspect(conn)
+    for table, ddl in (
+        # Existing findings get the upgrade time (a fast default, no table rewrite)
+        ("findings", f"TIMESTAMP NOT NULL DEFAULT {_UTC_NOW}"),
+        # NULL means "unknown start": such projects are queried without a pruning bound
+        ("projects", "TIMESTAMP"),
+        ("findings_archive", "TIMESTAMP"),
+    ):
+        if not insp.has_table(table, schema=schema):
+            continue
+        if "created_at" not in {c["name"] for c in insp.get_columns(table, schema=schema)}:
+            conn.execute(text(f"ALTER TABLE {_qualified(table, schema)} ADD COLUMN created_at {ddl}"))
+
+
+def prepare_schema(conn: Connection):
+    """Startup schema check: create tables (partitioned when enabled) and upcoming partitions."""
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _DDL_LOCK_ID})
+    if settings.PARTITIONING_ENABLED:
+        Base.metadata.create_all(conn, tables=[User.__table__, Project.__table__])
+        existing = set(inspect(conn).get_table_names())
+        for name in PARTITIONED_TABLES:
+            if name not in existing:
+                partitioned_table(name).create(conn)
+            elif not is_partitioned(conn, name):
+                log.warning("%s is a plain table; run `python -m app.core.partitioning migrate`", name)
+    Base.metadata.create_all(conn)
+    ensure_columns(conn)
+    if settings.PARTITIONING_ENABLED:
+        for name in PARTITIONED_TABLES:
+            if is_partitioned(conn, name):
+                ensure_partitions(conn, name)
+
+
+def migrate(conn: Connection, name: str, drop_old: bool = False, schema: Optional[str] = None):
+    """Rebuild a heap table as a partitioned one, copying its rows. Run during a maintenance window."""
+    if is_partitioned(conn, name, schema):
+        log.info("%s is already partitioned", name)
+        return
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _DDL_LOCK_ID})
+    ensure_columns(conn, schema)
+    qname = _qualified(name, schema)
+    old = f"{name}_unpartitioned"
+    conn.execute(text(f"UPDATE {qname} SET created_at = {_UTC_NOW} WHERE created_at IS NULL"))
+
+    # Move the old table, its sequence and its indexes out of the way of the new names
+    conn.execute(text(f'ALTER TABLE {qname} RENAME TO "{old}"'))
+    conn.execute(text(f'ALTER SEQUENCE {_qualified(name + "_id_seq", schema)} RENAME TO "{old}_id_seq"'))
+    for (index,) in conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = :t AND schemaname = coalesce(:s, current_schema())"
+    ), {"t": old, "s": schema}).all():
+        conn.execute(text(f'ALTER INDEX {_qualified(index, schema)} RENAME TO "{index.replace(name, old, 1)}"'))
+
+    partitioned_table(name, schema).create(conn)
+    first = conn.execute(text(f"SELECT min(created_at) FROM {_qualified(old, schema)}")).scalar()
+    ensure_partitions(conn, name, start=first.date() if first else None, schema=schema)
+
+    cols = ", ".join(f'"{c.name}"' for c in PARTITIONED_TABLES[name].columns)
+    conn.execute(text(f"INSERT INTO {qname} ({cols}) SELECT {cols} FROM {_qualified(old, schema)}"))
+    # Continue the old sequence: ids already moved to the archive table must never be
+    # handed out again, or archived and hot rows would share ids
+    floors = [f"(SELECT last_value FROM {_qualified(old + '_id_seq', schema)})",
+              f"(SELECT max(id) FROM {qname})"]
+    archive = ARCHIVE_TABLES[name]
+    if inspect(conn).has_table(archive, schema=schema):
+        floors.append(f"(SELECT max(id) FROM {_qualified(archive, schema)})")
+    conn.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{qname}', 'id'), "
+        f"coalesce(greatest({', '.join(floors)}), 0) + 1, false)"
+    ))
+    if drop_old:
+        conn.execute(text(f"DROP TABLE {_qualified(old, schema)}"))
+    log.info("migrated %s to monthly partitions (old table %s)", name, "dropped" if drop_old else f"kept as {old}")
+
+
+def main(argv=None):
+    from app.core.db import engine
+
+    ap = argparse.ArgumentParser(description="Manage findings/reports partitions")
+    ap.add_argument("command", choices=["ensure", "migrate"])
+    ap.add_argument("--months-ahead", type=int, default=None)
+    ap.add_argument("--drop-old", action="store_true", help="migrate: drop the *_unpartitioned copy")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as conn:
+        if args.command == "migrate":
+            for name in PARTITIONED_TABLES:
+                migrate(conn, name, drop_old=args.drop_old)
+            # Projects that predate the column start at their earliest finding or report;
+            # old findings all carry the upgrade time, old reports keep their real one
+            conn.execute(text(
+                "UPDATE projects p SET created_at = a.first FROM ("
+                "  SELECT project_id, min(created_at) AS first FROM ("
+                "    SELECT project_id, created_at FROM findings"
+                "    UNION ALL SELECT project_id, created_at FROM reports"
+                "  ) rows GROUP BY project_id"
+                ") a WHERE p.id = a.project_id AND p.created_at IS NULL"
+            ))
+        for name in PARTITIONED_TABLES:
+            if is_partitioned(conn, name):
+                n = ensure_partitions(conn, name, months_ahead=args.months_ahead)
+                print(f"{name}: created {n} partition(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# backend/app/core/serving.py
+"""
+Production serving profile: worker count and the per-worker DB pool budget.
+
+Every worker process (in every container) owns its own SQLAlchemy pool, so the
+total connection count is  instances * workers * (pool_size + max_overflow).
+That must stay under Postgres' max_connections (set in infra/docker-compose.yml)
+minus the slots kept back for superuser/admin tools. The budget only applies
+under gunicorn (gunicorn.conf.py calls use_worker_budget()); single-process
+uvicorn, seeders and cron jobs keep SQLAlchemy's default pool.
+"""
+import math
+import os
+from typing import Dict
+
+from app.core.config import settings
+
+
+# Set in the gunicorn master; forked workers inherit it
+_worker_budget = False
+
+
+def use_worker_budget():
+    global _worker_budget
+    _worker_budget = True
+
+
+def worker_count() -> int:
+    if settings.WEB_WORKERS > 0:
+        return settings.WEB_WORKERS
+    # gunicorn's usual (2 x cores) + 1, capped so small DBs aren't overrun
+    return min((os.cpu_count() or 1) * 2 + 1, settings.WEB_WORKERS_MAX)
+
+
+def db_pool_budget() -> Dict[str, int]:
+    """pool_size/max_overflow for one worker so the fleet never exceeds max_connections."""
+    if settings.DB_POOL_SIZE is not None:
+        return {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW or 0}
+    if not _worker_budget:
+        return {}
+
+    available = settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    per_worker = available // (max(1, settings.INSTANCE_COUNT) * worker_count())
+    if per_worker < 1:
+        raise RuntimeError(
+            f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} cannot serve "
+            f"{settings.INSTANCE_COUNT} instance(s) x {worker_count()} worker(s); "
+            "lower WEB_WORKERS/INSTANCE_COUNT or raise max_connections"
+        )
+    # Keep most of the budget as persistent connections, the rest as burst overflow
+    pool_size = max(1, math.ceil(per_worker * 0.6))
+    return {"pool_size": pool_size, "max_overflow": per_worker - pool_size}
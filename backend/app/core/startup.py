@@ -0,0 +1,53 @@
+# backend/app/core/startup.py
+"""
+Startup helpers used by the FastAPI lifespan in app/main.py.
+
+Nothing here runs at import time: the schema check waits for the lifespan
+(with retry/backoff, so a briefly unavailable DB doesn't kill the process),
+and heavy export libraries are only imported on first use or by warm_up().
+"""
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.db import engine
+
+log = logging.getLogger("app.startup")
+
+
+def init_db_with_retry():
+    """Wait for the database and (optionally) create missing tables and partitions."""
+    from app.core.partitioning import prepare_schema
+
+    attempts = max(1, settings.DB_STARTUP_RETRIES)
+    delay = settings.DB_STARTUP_BACKOFF
+    for attempt in range(1, attempts + 1):
+        try:
+            if settings.SCHEMA_CHECK_ON_STARTUP:
+                # simple for beginners; later use Alembic
+                with engine.begin() as conn:
+                    prepare_schema(conn)
+            else:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            return
+        except OperationalError as exc:
+            if attempt == attempts:
+                raise
+            log.warning("database not ready (attempt %d/%d): %s; retrying in %.1fs",
+                        attempt, attempts, exc.orig, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, settings.DB_STARTUP_BACKOFF_MAX)
+
+
+def warm_up():
+    """Pay one-off costs before the first request: export libraries and a pooled connection."""
+    started = time.perf_counter()
+    import app.services.report_service  # noqa: F401  (reportlab)
+    import app.services.excel_service  # noqa: F401  (openpyxl)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    log.info("warm-up finished in %.3fs", time.perf_counter() - started)
@@ -1,15 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, JSONResponse
 from app.core.config import settings
 from app.core.db import engine
-from app.models.models import Base
+from app.core.draining import inflight, SHUTDOWN_MARGIN
+from app.core.metrics import MetricsMiddleware, PROMETHEUS_CONTENT_TYPE, flush_shared, render_all, start_flusher
+from app.core.startup import init_db_with_retry, warm_up
 from app.routers.tester import router as tester_router
 from app.routers.auth import router as auth_router
 
-app = FastAPI(title="360 Cybersecurity Backend (Tester)")
 
-# Create tables on startup (simple for beginners; later use Alembic)
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema check waits for the DB with backoff instead of failing at import time
+    await run_in_threadpool(init_db_with_retry)
+    if settings.WARMUP_ON_STARTUP:
+        await run_in_threadpool(warm_up)
+    metrics_flusher = start_flusher()
+    # Flag draining as soon as SIGTERM arrives, and keep serving DRAIN_DELAY seconds
+    inflight.install_signal_handlers(
+        min(settings.DRAIN_DELAY, max(settings.GRACEFUL_TIMEOUT - SHUTDOWN_MARGIN, 0)))
+    yield
+    # Shutdown: let report jobs/uploads still running in the threadpool finish, within
+    # gunicorn's graceful_timeout (counted from SIGTERM) minus time to close the pool
+    await run_in_threadpool(inflight.drain, max(settings.GRACEFUL_TIMEOUT - SHUTDOWN_MARGIN, 0))
+    if metrics_flusher:
+        metrics_flusher.set()
+        # Final snapshot before exiting; gunicorn's child_exit merges it into the aggregate
+        flush_shared()
+    engine.dispose()
+
+app = FastAPI(title="360 Cybersecurity Backend (Tester)", lifespan=lifespan)
 
 # CORS for frontend
 app.add_middleware(
@@ -20,9 +43,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency + per-request DB stats (see app/core/metrics.py)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.get("/health")
 def health():
+    if inflight.draining:
+        return JSONResponse({"ok": False, "draining": True}, status_code=503)
     return {"ok": True}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_all(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 app.include_router(auth_router)
 app.include_router(tester_router)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 import enum, datetime
 import datetime
@@ -54,6 +54,8 @@ class Project(Base):
     title = Column(String, nullable=False)
     status = Column(String, default="Not Started")
     due_date = Column(Date)
+    # Lower bound for its findings' created_at, so per-project queries prune partitions
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
 class Assignment(Base):
     __tablename__ = "assignments"
@@ -71,6 +73,12 @@ class Finding(Base):
     description = Column(Text)
     poc_path = Column(String)  # file path (dev) or S3 key (prod)
     status = Column(String, default="open")
+    # Partition key when PARTITIONING_ENABLED (see app/core/partitioning.py)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_findings_project_tester_created", "project_id", "tester_id", "created_at"),
+    )
 
 class Report(Base):
     __tablename__ = "reports"
@@ -79,4 +87,33 @@ class Report(Base):
     tester_id = Column(Integer, ForeignKey("users.id"))
     file_path = Column(String)
     summary = Column(Text)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_reports_tester_project_created", "tester_id", "project_id", "created_at"),
+    )
+
+# --- archive tier (see app/services/archive_service.py) ---
+# Same ids as the hot rows they replace, so download URLs keep working.
+class ReportArchive(Base):
+    __tablename__ = "reports_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    tester_id = Column(Integer, ForeignKey("users.id"))
+    file_path = Column(String)   # gzip in ARCHIVE_DIR; None if the PDF was already gone
+    summary = Column(Text)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class FindingArchive(Base):
+    __tablename__ = "findings_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    tester_id = Column(Integer, ForeignKey("users.id"))
+    title = Column(String, nullable=False)
+    severity = Column(String)
+    description = Column(Text)
+    poc_path = Column(String)    # gzip in ARCHIVE_DIR
+    status = Column(String)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.datetime.utcnow)
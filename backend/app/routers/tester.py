@@ -1,37 +1,112 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, Form, HTTPException, Body
 from sqlalchemy.orm import Session
 from pathlib import Path
 from fastapi.responses import FileResponse
 from fastapi.responses import StreamingResponse
-import csv, io
+import csv, io, os, uuid, datetime
 
+from app.core.config import settings
 from app.core.db import SessionLocal
+from app.core.draining import inflight
 from app.auth.deps import require_role
-from app.models.models import Project, Assignment, Finding, Report, Client, ServiceTask, ServiceStage
+from app.models.models import (
+    Project, Assignment, Finding, Report, Client, ServiceTask, ServiceStage,
+    ReportArchive, FindingArchive,
+)
 
 from typing import Optional, List, Dict, Any
-from sqlalchemy import func, desc
-from app.services.report_service import generate_report_pdf
-from app.services.excel_service import findings_to_xlsx
+from sqlalchemy import func, desc, literal, select
+from app.services.archive_service import archive_reports, open_archived
 
 
 router = APIRouter(prefix="/tester", tags=["tester"])
 
-uploads_dir = Path(__file__).resolve().parents[2] / "uploads"
-uploads_dir.mkdir(exist_ok=True)
+# Point UPLOADS_DIR at a shared volume when running several containers
+uploads_dir = Path(settings.UPLOADS_DIR) if settings.UPLOADS_DIR else Path(__file__).resolve().parents[2] / "uploads"
+
+def _upload_path(name: str) -> Path:
+    # Created on first write rather than at import time
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    return uploads_dir / name
+
+def _tmp_path(dest: Path) -> Path:
+    # Workers/containers may write the same name at once; write aside, then os.replace
+    return dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+
+# reportlab/openpyxl are slow to import, so the services load on first use
+def generate_report_pdf(dest_path: Path, *args, **kwargs):
+    from app.services.report_service import generate_report_pdf as _generate
+    tmp = _tmp_path(dest_path)
+    try:
+        _generate(tmp, *args, **kwargs)
+        os.replace(tmp, dest_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return dest_path
+
+def findings_to_xlsx(rows):
+    from app.services.excel_service import findings_to_xlsx as _to_xlsx
+    return _to_xlsx(rows)
+
+def _project_start(project_id: int):
+    """Lower bound for created_at of a project's findings, as a scalar subquery (no extra round trip)."""
+    # A day of slack for clock skew between app servers; partitions are monthly anyway.
+    # Projects that predate the column have no start: don't bound them at all.
+    started = select(Project.created_at - datetime.timedelta(days=1)).where(
+        Project.id == project_id).scalar_subquery()
+    return func.coalesce(started, datetime.datetime.min)
+
+def _project_findings(db, project_id: int, tester_id: int):
+    q = db.query(Finding).filter(Finding.project_id == project_id, Finding.tester_id == tester_id)
+    if settings.PARTITIONING_ENABLED:
+        # Lets Postgres prune (at execution time) partitions from before the project started
+        q = q.filter(Finding.created_at >= _project_start(project_id))
+    return q
+
+_EXPORT_COLUMNS = ("id", "project_id", "title", "severity", "status", "description", "poc_path")
+
+def _all_project_findings(db, project_id: int, tester_id: int, include_archived: bool = True):
+    """A project's findings as rows, newest first, in one query.
+
+    Archived findings still belong to their project, so every view (listing, exports,
+    reports, client counts) includes them unless include_archived=False.
+    """
+    hot = _project_findings(db, project_id, tester_id).with_entities(
+        *(getattr(Finding, c).label(c) for c in _EXPORT_COLUMNS), literal(False).label("archived"))
+    if not include_archived:
+        return hot.order_by(desc(Finding.id))
+    cold = db.query(
+        *(getattr(FindingArchive, c).label(c) for c in _EXPORT_COLUMNS), literal(True).label("archived")
+    ).filter(FindingArchive.project_id == project_id, FindingArchive.tester_id == tester_id)
+    return hot.union_all(cold).order_by(desc("id"))
 
 def _project_summary(db, project_id: int, tester_id: int) -> str:
-    total = db.query(func.count(Finding.id)).filter(
-        Finding.project_id == project_id, Finding.tester_id == tester_id
-    ).scalar()
-    crit = db.query(func.count(Finding.id)).filter(
-        Finding.project_id == project_id, Finding.tester_id == tester_id, Finding.severity == "Critical"
-    ).scalar()
-    high = db.query(func.count(Finding.id)).filter(
-        Finding.project_id == project_id, Finding.tester_id == tester_id, Finding.severity == "High"
-    ).scalar()
+    # One pass over the project's findings (hot and archived) instead of three COUNT queries
+    hot = _project_findings(db, project_id, tester_id).with_entities(Finding.severity.label("severity"))
+    cold = db.query(FindingArchive.severity.label("severity")).filter(
+        FindingArchive.project_id == project_id, FindingArchive.tester_id == tester_id)
+    sev = hot.union_all(cold).subquery()
+    total, crit, high = db.query(
+        func.count(),
+        func.count().filter(sev.c.severity == "Critical"),
+        func.count().filter(sev.c.severity == "High"),
+    ).select_from(sev).one()
     return f"Findings: {total} (Critical: {crit}, High: {high})"
 
+def _finding_statuses(db):
+    """(project_id, status) of every finding, hot or archived, for per-client counts."""
+    hot = db.query(Finding.project_id.label("project_id"), Finding.status.label("status"))
+    cold = db.query(FindingArchive.project_id.label("project_id"), FindingArchive.status.label("status"))
+    return hot.union_all(cold).subquery()
+
+def _trim_reports(project_id: int):
+    # Runs after the response is sent, in its own session
+    db: Session = SessionLocal()
+    try:
+        archive_reports(db, project_id=project_id)
+    finally:
+        db.close()
+
 
 @router.get("/clients")
 def my_clients(payload=Depends(require_role("tester"))):
@@ -49,14 +124,15 @@ def my_clients(payload=Depends(require_role("tester"))):
         func.count(assigned_projects.c.pid).label("project_count")
     ).group_by(assigned_projects.c.client_name).subquery()
 
-    # Count open findings per client_name
+    # Count open findings per client_name (archived findings still belong to their project)
+    findings = _finding_statuses(db)
     f_join = db.query(
         Project.client_name.label("client_name"),
-        func.count(Finding.id).label("open_findings")
-    ).join(Finding, Finding.project_id == Project.id
+        func.count().label("open_findings")
+    ).join(findings, findings.c.project_id == Project.id
     ).join(Assignment, Assignment.project_id == Project.id
     ).filter(
-        Assignment.tester_id == payload["sub"], Finding.status == "open"
+        Assignment.tester_id == payload["sub"], findings.c.status == "open"
     ).group_by(Project.client_name).subquery()
 
     # Left-join to clients table by name
@@ -108,13 +184,14 @@ def client_profile(client_id: int, payload=Depends(require_role("tester"))):
         Project.client_name == client.name
     ).order_by(desc(Project.id)).limit(10).all()
 
-    open_findings = db.query(func.count(Finding.id)).join(
-        Project, Finding.project_id == Project.id
+    findings = _finding_statuses(db)
+    open_findings = db.query(func.count()).select_from(findings).join(
+        Project, findings.c.project_id == Project.id
     ).join(Assignment, Assignment.project_id == Project.id
     ).filter(
         Assignment.tester_id == payload["sub"],
         Project.client_name == client.name,
-        Finding.status == "open"
+        findings.c.status == "open"
     ).scalar()
 
     return {
@@ -156,23 +233,29 @@ async def upload_finding(
     if not assigned:
         raise HTTPException(status_code=403, detail="Not assigned to this project")
 
-    poc_path = None
-    if poc:
-        dest = uploads_dir / f"poc_{payload['sub']}_{poc.filename}"
-        with dest.open("wb") as f:
-            f.write(await poc.read())
-        poc_path = str(dest)
-
-    finding = Finding(
-        project_id=project_id, tester_id=payload["sub"],
-        title=title, severity=severity, description=description,
-        poc_path=poc_path
-    )
-    db.add(finding); db.commit(); db.refresh(finding)
+    with inflight.track("upload"):
+        poc_path = None
+        if poc:
+            dest = _upload_path(f"poc_{payload['sub']}_{poc.filename}")
+            tmp = _tmp_path(dest)
+            try:
+                with tmp.open("wb") as f:
+                    f.write(await poc.read())
+                os.replace(tmp, dest)
+            finally:
+                tmp.unlink(missing_ok=True)
+            poc_path = str(dest)
+
+        finding = Finding(
+            project_id=project_id, tester_id=payload["sub"],
+            title=title, severity=severity, description=description,
+            poc_path=poc_path
+        )
+        db.add(finding); db.commit(); db.refresh(finding)
     return {"id": finding.id, "message": "Upload successful"}
 
 @router.post("/reports/generate")
-def generate_report(project_id: int, payload=Depends(require_role("tester"))):
+def generate_report(project_id: int, background: BackgroundTasks, payload=Depends(require_role("tester"))):
     db: Session = SessionLocal()
     # ensure assignment...
     assigned = db.query(Assignment).filter(
@@ -182,51 +265,60 @@ def generate_report(project_id: int, payload=Depends(require_role("tester"))):
     if not assigned:
         raise HTTPException(status_code=403, detail="Not assigned to this project")
 
-    # collect findings
-    rows = db.query(Finding).filter(
-        Finding.project_id == project_id,
-        Finding.tester_id == payload["sub"]
-    ).order_by(desc(Finding.id)).all()
+    # collect findings, including any already moved to the archive tier
+    rows = _all_project_findings(db, project_id, payload["sub"]).all()
     findings = [{"title": r.title, "severity": r.severity, "description": r.description or ""} for r in rows]
     summary = _project_summary(db, project_id, payload["sub"])
 
-    pdf_path = uploads_dir / f"report_proj{project_id}_tester{payload['sub']}.pdf"
-    generate_report_pdf(pdf_path, project_id, payload["sub"], summary=summary, findings=findings)
-
-    r = Report(project_id=project_id, tester_id=payload["sub"], file_path=str(pdf_path), summary=summary)
-    db.add(r); db.commit(); db.refresh(r)
+    with inflight.track("report"):
+        # One file per report (named by its id) so archiving keeps each version's own PDF
+        r = Report(project_id=project_id, tester_id=payload["sub"], summary=summary)
+        db.add(r); db.flush()
+        pdf_path = _upload_path(f"report_proj{project_id}_tester{payload['sub']}_{r.id}.pdf")
+        generate_report_pdf(pdf_path, project_id, payload["sub"], summary=summary, findings=findings)
+        r.file_path = str(pdf_path)
+        db.commit(); db.refresh(r)
+        if settings.ARCHIVE_ON_WRITE:
+            background.add_task(_trim_reports, project_id)
     return {"report_id": r.id, "download_url": f"/tester/reports/{r.id}/download"}
 
 @router.get("/reports/{report_id}/download")
 def download_report(report_id: int, payload=Depends(require_role("tester"))):
     db: Session = SessionLocal()
     r = db.query(Report).get(report_id)
-    if not r:
+    if r:
+        return FileResponse(r.file_path, filename=f"report_{report_id}.pdf")
+
+    # Older reports live in the archive tier; decompress from cold storage on demand
+    a = db.query(ReportArchive).get(report_id)
+    if not a or not a.file_path or not Path(a.file_path).exists():
         raise HTTPException(status_code=404, detail="Report not found")
-    return FileResponse(r.file_path, filename=f"report_{report_id}.pdf")
+    return StreamingResponse(
+        open_archived(a.file_path),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="report_{report_id}.pdf"'}
+    )
 
 @router.get("/findings/list")
-def list_findings(project_id: int, payload=Depends(require_role("tester"))):
+def list_findings(project_id: int, include_archived: bool = True, payload=Depends(require_role("tester"))):
     db: Session = SessionLocal()
-    q = db.query(Finding).filter(
-        Finding.project_id == project_id,
-        Finding.tester_id == payload["sub"]
-    ).order_by(Finding.id.desc())
-    return [
-        {
+    q = _all_project_findings(db, project_id, payload["sub"], include_archived)
+    items = []
+    for f in q.all():
+        item = {
             "id": f.id, "project_id": f.project_id, "title": f.title,
             "severity": f.severity, "status": f.status,
             "description": f.description, "poc_path": f.poc_path,
-        } for f in q.all()
-    ]
+        }
+        if f.archived:
+            item["archived"] = True
+        items.append(item)
+    return items
 
 @router.get("/findings/export.csv")
-def export_findings_csv(project_id: int, payload=Depends(require_role("tester"))):
+def export_findings_csv(project_id: int, include_archived: bool = True, payload=Depends(require_role("tester"))):
     db: Session = SessionLocal()
-    q = db.query(Finding).filter(
-        Finding.project_id == project_id,
-        Finding.tester_id == payload["sub"]
-    ).order_by(Finding.id.desc())
+    q = _all_project_findings(db, project_id, payload["sub"], include_archived)
 
     buf = io.StringIO()
     w = csv.writer(buf)
@@ -243,6 +335,7 @@ def export_findings_csv(project_id: int, payload=Depends(require_role("tester"))
 @router.get("/reports")
 def list_reports(
     project_id: Optional[int] = None,
+    include_archived: bool = False,
     payload=Depends(require_role("tester"))
 ) -> List[Dict[str, Any]]:
     db: Session = SessionLocal()
@@ -259,27 +352,41 @@ def list_reports(
             "summary": r.summary,
             "download_url": f"/tester/reports/{r.id}/download"
         })
+    if include_archived:
+        aq = db.query(ReportArchive).filter(ReportArchive.tester_id == payload["sub"])
+        if project_id is not None:
+            aq = aq.filter(ReportArchive.project_id == project_id)
+        for r in aq.order_by(desc(ReportArchive.created_at)).all():
+            items.append({
+                "id": r.id,
+                "project_id": r.project_id,
+                "created_at": r.created_at.isoformat() if r.created_at else None,
+                "summary": r.summary,
+                "download_url": f"/tester/reports/{r.id}/download",
+                "archived": True,
+            })
     return items
 
 @router.post("/reports/{report_id}/regenerate")
-def regenerate_report(report_id: int, payload=Depends(require_role("tester"))):
+def regenerate_report(report_id: int, background: BackgroundTasks, payload=Depends(require_role("tester"))):
     db: Session = SessionLocal()
-    old = db.query(Report).get(report_id)
+    old = db.query(Report).get(report_id) or db.query(ReportArchive).get(report_id)
     if not old or old.tester_id != payload["sub"]:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    rows = db.query(Finding).filter(
-        Finding.project_id == old.project_id,
-        Finding.tester_id == payload["sub"]
-    ).order_by(desc(Finding.id)).all()
+    rows = _all_project_findings(db, old.project_id, payload["sub"]).all()
     findings = [{"title": r.title, "severity": r.severity, "description": r.description or ""} for r in rows]
     summary = "Regenerated — " + _project_summary(db, old.project_id, payload["sub"])
 
-    new_pdf = uploads_dir / f"report_proj{old.project_id}_tester{payload['sub']}_re_{old.id}.pdf"
-    generate_report_pdf(new_pdf, old.project_id, payload["sub"], summary=summary, findings=findings)
-
-    new_row = Report(project_id=old.project_id, tester_id=payload["sub"], file_path=str(new_pdf), summary=summary)
-    db.add(new_row); db.commit(); db.refresh(new_row)
+    with inflight.track("report"):
+        new_row = Report(project_id=old.project_id, tester_id=payload["sub"], summary=summary)
+        db.add(new_row); db.flush()
+        new_pdf = _upload_path(f"report_proj{old.project_id}_tester{payload['sub']}_{new_row.id}.pdf")
+        generate_report_pdf(new_pdf, old.project_id, payload["sub"], summary=summary, findings=findings)
+        new_row.file_path = str(new_pdf)
+        db.commit(); db.refresh(new_row)
+        if settings.ARCHIVE_ON_WRITE:
+            background.add_task(_trim_reports, old.project_id)
     return {"report_id": new_row.id, "download_url": f"/tester/reports/{new_row.id}/download"}
 
 # Helper to ensure the tester is assigned to the project
@@ -367,7 +474,7 @@ def move_service(
     return {"id": task.id, "stage": task.stage.value, "order_index": task.order_index}
 
 @router.get("/findings/export.xlsx")
-def export_findings_xlsx(project_id: int, payload=Depends(require_role("tester"))):
+def export_findings_xlsx(project_id: int, include_archived: bool = True, payload=Depends(require_role("tester"))):
     db: Session = SessionLocal()
     # ensure tester is assigned to this project (reuse helper if you have it)
     assigned = db.query(Assignment).filter(
@@ -377,10 +484,7 @@ def export_findings_xlsx(project_id: int, payload=Depends(require_role("tester")
     if not assigned:
         raise HTTPException(status_code=403, detail="Not assigned to this project")
 
-    rows = db.query(Finding).filter(
-        Finding.project_id == project_id,
-        Finding.tester_id == payload["sub"]
-    ).order_by(Finding.id.desc()).all()
+    rows = _all_project_findings(db, project_id, payload["sub"], include_archived).all()
 
     buf = findings_to_xlsx(rows)
     filename = f"findings_project_{project_id}.xlsx"
@@ -1,15 +1,17 @@
 import datetime
 from app.core.db import SessionLocal, engine
 from app.models.models import (
-    Base, User, Project, Assignment, Role, Client,
+    User, Project, Assignment, Role, Client,
     ServiceTask, ServiceStage  # <-- new imports
 )
 from app.auth.security import hash_password
+from app.core.partitioning import prepare_schema
 
 
 def run():
-    # Create all tables (includes Client + ServiceTask)
-    Base.metadata.create_all(bind=engine)
+    # Create all tables (includes Client + ServiceTask; partitioned when enabled)
+    with engine.begin() as conn:
+        prepare_schema(conn)
 
     db = SessionLocal()
     try:
@@ -0,0 +1,261 @@
+# backend/app/seed_synthetic.py
+"""
+Synthetic dataset generator for benchmarking at production-like scale.
+
+    python -m app.seed_synthetic --scale medium
+    python -m app.seed_synthetic --clients 200 --findings-per-project 300 --seed 7
+
+Rows are written with bulk INSERTs (executemany / insertmanyvalues) in batches,
+so millions of findings load in minutes rather than hours. Output is
+deterministic for a given --seed and volume settings.
+"""
+import argparse
+import datetime
+import random
+import shutil
+import time
+from typing import Dict, List
+
+from sqlalchemy import insert, func
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal, engine
+from app.models.models import (
+    User, Role, Client, Project, Assignment, Finding, Report,
+    ServiceTask, ServiceStage,
+)
+from app.auth.security import hash_password
+from app.core.config import settings
+from app.core.partitioning import PARTITIONED_TABLES, ensure_partitions, is_partitioned, prepare_schema
+from app.routers.tester import uploads_dir
+
+SYNTH_DOMAIN = "synthetic.local"
+SYNTH_PASSWORD = "Bench@123"
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small":  dict(testers=5,   clients=20,   projects_per_client=3,  testers_per_project=2,
+                   findings_per_project=40,  tasks_per_project=10, reports_per_project=3),
+    "medium": dict(testers=25,  clients=200,  projects_per_client=5,  testers_per_project=3,
+                   findings_per_project=150, tasks_per_project=20, reports_per_project=10),
+    "large":  dict(testers=100, clients=1000, projects_per_client=8,  testers_per_project=3,
+                   findings_per_project=500, tasks_per_project=30, reports_per_project=25),
+}
+
+SEVERITIES = ["Critical", "High", "Medium", "Low"]
+SEVERITY_WEIGHTS = [5, 20, 45, 30]
+STATUSES = ["open", "open", "open", "fixed", "accepted"]
+PROJECT_STATUSES = ["Not Started", "In Progress", "In Progress", "Completed"]
+
+_TITLES = [
+    "SQL injection in {p}", "Reflected XSS in {p}", "Stored XSS in {p}", "IDOR on {p}",
+    "Missing rate limiting on {p}", "Weak TLS configuration on {p}", "Open redirect via {p}",
+    "Verbose error messages on {p}", "CSRF on {p}", "Session fixation on {p}",
+    "Insecure direct file access via {p}", "SSRF through {p}", "Outdated component on {p}",
+]
+_PATHS = ["/login", "/api/users", "/search", "/admin", "/profile", "/upload", "/reset-password",
+          "/api/orders", "/export", "/webhooks", "/graphql", "/api/v2/items"]
+_WORDS = (
+    "the application endpoint parameter request response attacker payload server header "
+    "session token cookie input validation user authenticated unauthenticated database "
+    "query error stack trace version component library exploit impact confidentiality "
+    "integrity availability remediation recommend sanitize encode restrict configure "
+    "observed during testing it was possible to retrieve modify data records"
+).split()
+
+
+def _description(rng: random.Random) -> str:
+    # Log-normal length: median ~650 chars, long tail up to ~8k (pasted requests/responses)
+    target = min(int(rng.lognormvariate(6.5, 0.8)), 8000)
+    words: List[str] = []
+    size = 0
+    while size < target:
+        w = rng.choice(_WORDS)
+        words.append(w)
+        size += len(w) + 1
+    text = " ".join(words)
+    if target > 2000:
+        text += "\n\nRequest:\nPOST /api/login HTTP/1.1\nHost: target\n\nusername=admin'--&password=x"
+    return text
+
+
+def _batched_insert(db: Session, model, rows: List[dict], batch_size: int, returning: bool = False):
+    ids: List[int] = []
+    for i in range(0, len(rows), batch_size):
+        chunk = rows[i:i + batch_size]
+        if returning:
+            ids.extend(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), chunk).all())
+        else:
+            db.execute(insert(model), chunk)
+    db.commit()
+    return ids
+
+
+def _report_files(project_ids: List[int], rng: random.Random) -> Dict[int, str]:
+    """One real PDF per project (copies of a single rendered template) so downloads can be benchmarked."""
+    from app.services.report_service import generate_report_pdf
+
+    out_dir = uploads_dir / "synthetic"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    template = out_dir / "_template.pdf"
+    findings = [
+        {"title": rng.choice(_TITLES).format(p=rng.choice(_PATHS)),
+         "severity": rng.choices(SEVERITIES, SEVERITY_WEIGHTS)[0],
+         "description": _description(rng)}
+        for _ in range(25)
+    ]
+    generate_report_pdf(template, 0, 0, summary="Synthetic report", findings=findings)
+
+    paths = {}
+    for pid in project_ids:
+        dest = out_dir / f"report_proj{pid}.pdf"
+        shutil.copyfile(template, dest)
+        paths[pid] = str(dest)
+    return paths
+
+
+def run(
+    testers: int, clients: int, projects_per_client: int, testers_per_project: int,
+    findings_per_project: int, tasks_per_project: int, reports_per_project: int,
+    seed: int = 42, batch_size: int = 5000,
+):
+    with engine.begin() as conn:
+        prepare_schema(conn)
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    now = datetime.datetime.utcnow()
+    started = time.perf_counter()
+
+    db: Session = SessionLocal()
+    try:
+        existing = db.query(func.count(User.id)).filter(User.email.like(f"%@{SYNTH_DOMAIN}")).scalar()
+        if existing:
+            raise SystemExit(f"{existing} synthetic users already present; use a fresh database")
+
+        # bcrypt is deliberately slow; hash once and share it
+        pw_hash = hash_password(SYNTH_PASSWORD)
+        tester_ids = _batched_insert(db, User, [
+            {"email": f"bench-tester-{i:04d}@{SYNTH_DOMAIN}", "password_hash": pw_hash, "role": Role.tester}
+            for i in range(1, testers + 1)
+        ], batch_size, returning=True)
+
+        client_names = [f"Synthetic Client {i:06d}" for i in range(1, clients + 1)]
+        _batched_insert(db, Client, [
+            {"name": name, "contact_name": f"Contact {i}", "contact_email": f"sec{i}@client.{SYNTH_DOMAIN}",
+             "contact_phone": f"+1-555-{i % 10000:04d}", "notes": ""}
+            for i, name in enumerate(client_names, start=1)
+        ], batch_size)
+
+        # Engagements start over the last three years, so findings spread across partitions
+        project_rows = [
+            {"client_name": name, "title": f"{name} — Engagement {j}",
+             "status": rng.choice(PROJECT_STATUSES),
+             "due_date": today + datetime.timedelta(days=rng.randint(-365, 90)),
+             "created_at": now - datetime.timedelta(days=rng.randint(0, 3 * 365))}
+            for name in client_names for j in range(1, projects_per_client + 1)
+        ]
+        if settings.PARTITIONING_ENABLED and project_rows:
+            # Backdated rows would otherwise all land in the *_default partitions
+            earliest = min(row["created_at"] for row in project_rows).date()
+            with engine.begin() as conn:
+                for name in PARTITIONED_TABLES:
+                    if is_partitioned(conn, name):
+                        ensure_partitions(conn, name, start=earliest)
+        project_ids = _batched_insert(db, Project, project_rows, batch_size, returning=True)
+        starts = {pid: row["created_at"] for pid, row in zip(project_ids, project_rows)}
+
+        def during(pid: int) -> datetime.datetime:
+            # Activity happens in the ~3 months after the engagement starts
+            return min(now, starts[pid] + datetime.timedelta(seconds=rng.randint(0, 90 * 86400)))
+
+        # The first tester is on every project so benchmarks see the worst case
+        per_project = min(testers_per_project, len(tester_ids))
+        assignments: Dict[int, List[int]] = {}
+        for pid in project_ids:
+            others = rng.sample(tester_ids[1:], max(per_project - 1, 0)) if len(tester_ids) > 1 else []
+            assignments[pid] = [tester_ids[0]] + others
+        _batched_insert(db, Assignment, [
+            {"project_id": pid, "tester_id": tid} for pid, tids in assignments.items() for tid in tids
+        ], batch_size)
+
+        n_findings = n_tasks = n_reports = 0
+        buf: List[dict] = []
+        for pid, tids in assignments.items():
+            for _ in range(findings_per_project):
+                buf.append({
+                    "project_id": pid, "tester_id": rng.choice(tids),
+                    "title": rng.choice(_TITLES).format(p=rng.choice(_PATHS)),
+                    "severity": rng.choices(SEVERITIES, SEVERITY_WEIGHTS)[0],
+                    "description": _description(rng),
+                    "poc_path": None, "status": rng.choice(STATUSES),
+                    "created_at": during(pid),
+                })
+            if len(buf) >= batch_size:
+                n_findings += len(buf)
+                _batched_insert(db, Finding, buf, batch_size); buf = []
+        n_findings += len(buf)
+        _batched_insert(db, Finding, buf, batch_size)
+
+        stages = list(ServiceStage)
+        buf = []
+        for pid, tids in assignments.items():
+            for k in range(tasks_per_project):
+                buf.append({
+                    "project_id": pid, "tester_id": rng.choice(tids),
+                    "title": f"Task {k + 1}", "description": "",
+                    "severity": rng.choices(SEVERITIES, SEVERITY_WEIGHTS)[0],
+                    "stage": rng.choice(stages), "order_index": k,
+                    "due_date": today + datetime.timedelta(days=rng.randint(-30, 60)),
+                })
+            if len(buf) >= batch_size:
+                n_tasks += len(buf)
+                _batched_insert(db, ServiceTask, buf, batch_size); buf = []
+        n_tasks += len(buf)
+        _batched_insert(db, ServiceTask, buf, batch_size)
+
+        # A project's reports share one file; archive_reports compresses a shared file once
+        report_paths = _report_files(project_ids, rng) if reports_per_project else {}
+        buf = []
+        for pid, tids in assignments.items():
+            for k in range(reports_per_project):
+                tid = rng.choice(tids)
+                buf.append({
+                    "project_id": pid, "tester_id": tid,
+                    "file_path": report_paths[pid],
+                    "summary": f"Findings: {rng.randint(0, findings_per_project)} (Critical: 0, High: 0)",
+                    "created_at": during(pid),
+                })
+            if len(buf) >= batch_size:
+                n_reports += len(buf)
+                _batched_insert(db, Report, buf, batch_size); buf = []
+        n_reports += len(buf)
+        _batched_insert(db, Report, buf, batch_size)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Generated {len(tester_ids)} testers, {clients} clients, {len(project_ids)} projects, "
+        f"{n_findings} findings, {n_tasks} tasks, {n_reports} reports in {elapsed:.1f}s\n"
+        f"Benchmark tester: bench-tester-0001@{SYNTH_DOMAIN} / {SYNTH_PASSWORD}"
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a synthetic dataset for benchmarks")
+    ap.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for name in SCALES["small"]:
+        ap.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name,
+                        help=f"override the preset's {name}")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--batch-size", type=int, default=5000)
+    args = ap.parse_args(argv)
+
+    volumes = dict(SCALES[args.scale])
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+    run(**volumes, seed=args.seed, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# backend/app/services/archive_service.py
+"""
+Retention and cold-storage tiering.
+
+- Reports: the latest REPORTS_KEEP_HOT per project stay in `reports`; older rows
+  move to `reports_archive` and their PDFs are gzipped into ARCHIVE_DIR.
+- Findings: findings of finished projects (status in ARCHIVE_PROJECT_STATUSES,
+  due more than ARCHIVE_PROJECTS_AFTER_DAYS ago) move to `findings_archive`
+  with their PoC files gzipped alongside.
+
+Archived rows keep their ids, and archived files are decompressed on demand
+when downloaded. Run periodically (cron / k8s CronJob):
+
+    python -m app.services.archive_service
+"""
+import datetime
+import gzip
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from sqlalchemy import func, insert, delete
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Report, ReportArchive, Finding, FindingArchive, Project
+
+BATCH_SIZE = 500
+
+
+def archive_dir() -> Path:
+    return Path(settings.ARCHIVE_DIR) if settings.ARCHIVE_DIR else Path(__file__).resolve().parents[2] / "archive"
+
+
+def _compress(src: Optional[str], dest_dir: Path, prefix: str) -> Optional[Path]:
+    """gzip `src` into `dest_dir`; returns the cold path, or None if src is missing."""
+    if not src or not os.path.exists(src):
+        return None
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / f"{prefix}_{Path(src).name}.gz"
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(src, "rb") as fin, gzip.open(tmp, "wb", compresslevel=6) as fout:
+            shutil.copyfileobj(fin, fout)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return dest
+
+
+def _unlink_hot(paths: List[Optional[str]], keep: set):
+    # Only after the DB commit; a file still referenced by a hot row stays put
+    for p in paths:
+        if p and p not in keep:
+            try:
+                os.unlink(p)
+            except FileNotFoundError:
+                pass
+
+
+def archive_reports(db: Session, project_id: Optional[int] = None, keep: Optional[int] = None) -> int:
+    """Move all but the newest `keep` reports of each project to the archive tier."""
+    keep = settings.REPORTS_KEEP_HOT if keep is None else keep
+    rank = func.row_number().over(
+        partition_by=Report.project_id, order_by=(Report.created_at.desc(), Report.id.desc())
+    ).label("rank")
+    ranked = db.query(Report.id.label("id"), rank)
+    if project_id is not None:
+        ranked = ranked.filter(Report.project_id == project_id)
+    ranked = ranked.subquery()
+    old_ids = [rid for (rid,) in db.query(ranked.c.id).filter(ranked.c.rank > keep).order_by(ranked.c.id)]
+
+    moved = 0
+    # Rows may share a file (synthetic data, reports from before per-report files):
+    # compress each distinct path once and point every such row at that one gz
+    compressed = {}
+    for i in range(0, len(old_ids), BATCH_SIZE):
+        # A concurrent run (another generate, or cron) owns rows it has locked; skip them
+        rows = (db.query(Report).filter(Report.id.in_(old_ids[i:i + BATCH_SIZE]))
+                .with_for_update(skip_locked=True).all())
+        if not rows:
+            db.rollback()
+            continue
+        now = datetime.datetime.utcnow()
+        archived = []
+        for r in rows:
+            cold = compressed.get(r.file_path)
+            if cold is None:
+                cold = compressed[r.file_path] = _compress(
+                    r.file_path, archive_dir() / "reports" / f"proj{r.project_id}", str(r.id))
+            archived.append({
+                "id": r.id, "project_id": r.project_id, "tester_id": r.tester_id,
+                "file_path": str(cold) if cold else None, "summary": r.summary,
+                "created_at": r.created_at, "archived_at": now,
+            })
+        hot_paths = [r.file_path for r in rows]
+        ids = [r.id for r in rows]
+        db.execute(insert(ReportArchive), archived)
+        db.execute(delete(Report).where(Report.id.in_(ids)))
+        db.commit()
+        # A newer hot row may still share the file
+        still_hot = {p for (p,) in db.query(Report.file_path).filter(Report.file_path.in_(
+            [p for p in hot_paths if p]))}
+        _unlink_hot(hot_paths, still_hot)
+        moved += len(rows)
+    return moved
+
+
+def archive_findings(db: Session, older_than_days: Optional[int] = None) -> int:
+    """Move findings of finished, past-due projects to the archive tier."""
+    days = settings.ARCHIVE_PROJECTS_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.date.today() - datetime.timedelta(days=days)
+    project_ids = [pid for (pid,) in db.query(Project.id).filter(
+        Project.status.in_(settings.ARCHIVE_PROJECT_STATUSES),
+        Project.due_date < cutoff,
+    )]
+
+    moved = 0
+    for pid in project_ids:
+        while True:
+            rows = (db.query(Finding).filter(Finding.project_id == pid).order_by(Finding.id)
+                    .limit(BATCH_SIZE).with_for_update(skip_locked=True).all())
+            if not rows:
+                break
+            now = datetime.datetime.utcnow()
+            archived = []
+            for f in rows:
+                cold = _compress(f.poc_path, archive_dir() / "poc" / f"proj{pid}", str(f.id))
+                archived.append({
+                    "id": f.id, "project_id": f.project_id, "tester_id": f.tester_id,
+                    "title": f.title, "severity": f.severity, "description": f.description,
+                    "poc_path": str(cold) if cold else None, "status": f.status,
+                    "created_at": f.created_at, "archived_at": now,
+                })
+            hot_paths = [f.poc_path for f in rows]
+            db.execute(insert(FindingArchive), archived)
+            db.execute(delete(Finding).where(Finding.id.in_([f.id for f in rows])))
+            db.commit()
+            still_hot = {p for (p,) in db.query(Finding.poc_path).filter(Finding.poc_path.in_(
+                [p for p in hot_paths if p]))}
+            _unlink_hot(hot_paths, still_hot)
+            moved += len(rows)
+    return moved
+
+
+def open_archived(path: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Stream an archived artefact, decompressing on the fly."""
+    with gzip.open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            yield chunk
+
+
+def run():
+    from app.core.db import SessionLocal, engine
+    from app.core.partitioning import prepare_schema
+
+    with engine.begin() as conn:
+        prepare_schema(conn)
+    db = SessionLocal()
+    try:
+        reports = archive_reports(db)
+        findings = archive_findings(db)
+    finally:
+        db.close()
+    print(f"Archived {reports} reports and {findings} findings to {archive_dir()}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,259 @@
+# backend/bench/api_bench.py
+"""
+In-process benchmark of the tester API.
+
+Drives `app.main:app` through httpx's ASGI transport (no network, no uvicorn),
+so numbers reflect the app + database only. Load data first:
+
+    python -m app.seed_synthetic --scale medium
+    python -m bench.api_bench --save-baseline bench/baseline.json
+    # ... change code ...
+    python -m bench.api_bench --compare bench/baseline.json
+
+Reports throughput, p50/p95/p99 latency and SQL statements per request
+(taken from the /metrics registry, so METRICS_ENABLED must be true).
+Exits 1 when --compare finds a regression beyond --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.metrics import registry
+from app.auth.security import create_token
+from app.models.models import User, Project, Assignment, Client, Report, ServiceTask, Finding
+from app.seed_synthetic import SYNTH_DOMAIN
+
+
+class Scenario:
+    def __init__(self, name: str, method: str, route: str, build: Callable[[random.Random], dict],
+                 iterations: int, write: bool = False):
+        self.name = name
+        self.method = method
+        self.route = route          # route template, matches the /metrics label
+        self.build = build          # rng -> kwargs for httpx request (url, params, ...)
+        self.iterations = iterations
+        self.write = write
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank; stable for small samples
+    if not sorted_values:
+        return 0.0
+    k = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(k, len(sorted_values) - 1))]
+
+
+def load_fixture(tester_email: str) -> dict:
+    db = SessionLocal()
+    try:
+        tester = db.query(User).filter(User.email == tester_email).first()
+        if not tester:
+            raise SystemExit(f"No user {tester_email}; run `python -m app.seed_synthetic` first")
+        project_ids = [pid for (pid,) in db.query(Assignment.project_id).filter(
+            Assignment.tester_id == tester.id).all()]
+        if not project_ids:
+            raise SystemExit(f"{tester_email} has no assigned projects")
+        names = [n for (n,) in db.query(Project.client_name).filter(Project.id.in_(project_ids)).distinct()]
+        client_ids = [cid for (cid,) in db.query(Client.id).filter(Client.name.in_(names)).all()]
+        report_ids = [rid for (rid,) in db.query(Report.id).filter(Report.tester_id == tester.id).limit(1000)]
+        task_ids = [tid for (tid,) in db.query(ServiceTask.id).filter(ServiceTask.tester_id == tester.id).limit(1000)]
+        sizes = {
+            "projects": db.query(Project).count(),
+            "findings": db.query(Finding).count(),
+            "reports": db.query(Report).count(),
+        }
+        return {"tester_id": tester.id, "project_ids": project_ids, "client_ids": client_ids,
+                "report_ids": report_ids, "task_ids": task_ids, "dataset": sizes}
+    finally:
+        db.close()
+
+
+def build_scenarios(fx: dict, scale: float) -> List[Scenario]:
+    pick = lambda key: (lambda rng: rng.choice(fx[key]))  # noqa: E731
+    n = lambda base: max(1, int(base * scale))  # noqa: E731
+    scenarios = [
+        Scenario("clients", "GET", "/tester/clients",
+                 lambda rng: {"url": "/tester/clients"}, n(100)),
+        Scenario("projects", "GET", "/tester/projects",
+                 lambda rng: {"url": "/tester/projects"}, n(200)),
+        Scenario("findings_list", "GET", "/tester/findings/list",
+                 lambda rng: {"url": "/tester/findings/list", "params": {"project_id": pick("project_ids")(rng)}}, n(200)),
+        Scenario("findings_csv", "GET", "/tester/findings/export.csv",
+                 lambda rng: {"url": "/tester/findings/export.csv", "params": {"project_id": pick("project_ids")(rng)}}, n(100)),
+        Scenario("findings_xlsx", "GET", "/tester/findings/export.xlsx",
+                 lambda rng: {"url": "/tester/findings/export.xlsx", "params": {"project_id": pick("project_ids")(rng)}}, n(30)),
+        Scenario("reports_list", "GET", "/tester/reports",
+                 lambda rng: {"url": "/tester/reports"}, n(100)),
+        Scenario("reports_list_project", "GET", "/tester/reports",
+                 lambda rng: {"url": "/tester/reports", "params": {"project_id": pick("project_ids")(rng)}}, n(200)),
+        Scenario("services", "GET", "/tester/services",
+                 lambda rng: {"url": "/tester/services", "params": {"project_id": pick("project_ids")(rng)}}, n(200)),
+        Scenario("finding_create", "POST", "/tester/findings",
+                 lambda rng: {"url": "/tester/findings",
+                              "data": {"project_id": pick("project_ids")(rng), "title": "bench finding",
+                                       "severity": "Medium", "description": "x" * 800},
+                              "files": {"poc": ("bench.txt", b"proof-of-concept\n" * 64, "text/plain")}},
+                 n(50), write=True),
+        Scenario("service_create", "POST", "/tester/services",
+                 lambda rng: {"url": "/tester/services",
+                              "json": {"project_id": pick("project_ids")(rng), "title": "bench task"}},
+                 n(50), write=True),
+        Scenario("report_generate", "POST", "/tester/reports/generate",
+                 lambda rng: {"url": "/tester/reports/generate", "params": {"project_id": pick("project_ids")(rng)}},
+                 n(10), write=True),
+    ]
+    if fx["client_ids"]:
+        scenarios.insert(1, Scenario(
+            "client_profile", "GET", "/tester/clients/{client_id}",
+            lambda rng: {"url": f"/tester/clients/{pick('client_ids')(rng)}"}, n(100)))
+    if fx["task_ids"]:
+        scenarios.append(Scenario(
+            "service_move", "PATCH", "/tester/services/{task_id}/stage",
+            lambda rng: {"url": f"/tester/services/{pick('task_ids')(rng)}/stage",
+                         "json": {"stage": rng.choice(["not_started", "in_progress", "validated"])}},
+            n(50), write=True))
+    if fx["report_ids"]:
+        # Reads only, so it runs with --read-only too; synthetic reports have real PDFs
+        scenarios.insert(len([sc for sc in scenarios if not sc.write]), Scenario(
+            "report_download", "GET", "/tester/reports/{report_id}/download",
+            lambda rng: {"url": f"/tester/reports/{pick('report_ids')(rng)}/download"}, n(100)))
+        scenarios.append(Scenario(
+            "report_regenerate", "POST", "/tester/reports/{report_id}/regenerate",
+            lambda rng: {"url": f"/tester/reports/{pick('report_ids')(rng)}/regenerate"},
+            n(10), write=True))
+    return scenarios
+
+
+async def _run_scenario(client: httpx.AsyncClient, sc: Scenario, concurrency: int, seed: int) -> dict:
+    rng = random.Random(f"{seed}:{sc.name}")
+    requests = [sc.build(rng) for _ in range(sc.iterations)]
+    latencies: List[float] = []
+    errors = 0
+    queue = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for kwargs in queue:
+            t0 = time.perf_counter()
+            resp = await client.request(sc.method, **kwargs)
+            await resp.aread()
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code >= 400:
+                errors += 1
+
+    registry.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    hist = registry.queries.get((sc.method, sc.route))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "queries_per_request": round(hist.sum / hist.count, 2) if hist and hist.count else None,
+    }
+
+
+async def run(tester_email: str, concurrency: int, scale: float, seed: int,
+              only: Optional[List[str]], include_writes: bool) -> dict:
+    from app.main import app  # imported late so --help works without a database
+
+    fx = load_fixture(tester_email)
+    token = create_token(fx["tester_id"], "tester")
+    scenarios = [
+        sc for sc in build_scenarios(fx, scale)
+        if (include_writes or not sc.write) and (not only or sc.name in only)
+    ]
+
+    results: Dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 headers={"Authorization": f"Bearer {token}"}, timeout=None) as client:
+        for sc in scenarios:
+            # One untimed request to warm caches and lazy imports
+            await client.request(sc.method, **sc.build(random.Random(seed)))
+            results[sc.name] = await _run_scenario(client, sc, concurrency, seed)
+            r = results[sc.name]
+            print(f"{sc.name:22s} {r['throughput_rps']:9.1f} req/s  p50 {r['p50_ms']:8.2f}  "
+                  f"p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms  "
+                  f"q/req {r['queries_per_request']}  err {r['errors']}")
+
+    return {
+        "meta": {
+            "concurrency": concurrency, "scale": scale, "seed": seed,
+            "python": platform.python_version(), "dataset": fx["dataset"],
+            "database": settings.DATABASE_URL.split("@")[-1],
+        },
+        "endpoints": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    problems = []
+    for name, base in baseline.get("endpoints", {}).items():
+        cur = current["endpoints"].get(name)
+        if cur is None:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[key] and cur[key] > base[key] * (1 + tolerance):
+                problems.append(f"{name}: {key} {base[key]} -> {cur[key]}")
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            problems.append(f"{name}: throughput_rps {base['throughput_rps']} -> {cur['throughput_rps']}")
+        bq, cq = base.get("queries_per_request"), cur.get("queries_per_request")
+        if bq is not None and cq is not None and cq > bq:
+            # Query counts are deterministic, so any increase is a regression
+            problems.append(f"{name}: queries_per_request {bq} -> {cq}")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark tester endpoints in-process")
+    ap.add_argument("--tester-email", default=f"bench-tester-0001@{SYNTH_DOMAIN}")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply per-endpoint iteration counts")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--only", nargs="*", help="scenario names to run")
+    ap.add_argument("--read-only", action="store_true", help="skip endpoints that write data/files")
+    ap.add_argument("--output", help="write results JSON here")
+    ap.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    ap.add_argument("--compare", metavar="PATH", help="compare against a baseline JSON")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown")
+    args = ap.parse_args(argv)
+
+    if not settings.METRICS_ENABLED:
+        print("METRICS_ENABLED=false: query counts will be missing", file=sys.stderr)
+
+    result = asyncio.run(run(args.tester_email, args.concurrency, args.scale, args.seed,
+                             args.only, not args.read_only))
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as fh:
+            json.dump(result, fh, indent=2, sort_keys=True)
+        print(f"wrote {path}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            problems = compare(result, json.load(fh), args.tolerance)
+        if problems:
+            print("REGRESSIONS:\n  " + "\n  ".join(problems))
+            sys.exit(1)
+        print("no regressions vs baseline")
+
+
+if __name__ == "__main__":
+    main()
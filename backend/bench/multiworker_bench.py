@@ -0,0 +1,146 @@
+# backend/bench/multiworker_bench.py
+"""
+Multi-worker throughput benchmark over real HTTP.
+
+For each worker count, starts `gunicorn -c gunicorn.conf.py app.main:app`,
+drives read endpoints for a fixed duration, then sends SIGTERM and times the
+graceful drain. Needs a loaded database (python -m app.seed_synthetic).
+
+    python -m bench.multiworker_bench --workers 1 2 4 --duration 20 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+from app.auth.security import create_token
+from app.seed_synthetic import SYNTH_DOMAIN
+from bench.api_bench import load_fixture, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"server at {base_url} did not become ready")
+
+
+async def _drive(base_url: str, token: str, project_ids: List[int], duration: float,
+                 concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    def next_request():
+        pid = rng.choice(project_ids)
+        return rng.choice([
+            ("/tester/projects", None),
+            ("/tester/findings/list", {"project_id": pid}),
+            ("/tester/reports", {"project_id": pid}),
+            ("/tester/services", {"project_id": pid}),
+        ])
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0,
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < stop_at:
+                url, params = next_request()
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.get(url, params=params)
+                    if resp.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - t0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies), "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_one(workers: int, args, token: str, project_ids: List[int]) -> dict:
+    port = _free_port()
+    env = dict(os.environ, WEB_WORKERS=str(workers), WEB_BIND=f"127.0.0.1:{port}")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url)
+        result = asyncio.run(_drive(base_url, token, project_ids, args.duration, args.concurrency, args.seed))
+        t0 = time.perf_counter()
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=120)
+        result["shutdown_s"] = round(time.perf_counter() - t0, 3)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    result["workers"] = workers
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Throughput vs gunicorn worker count")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--duration", type=float, default=15.0, help="seconds of load per worker count")
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--tester-email", default=f"bench-tester-0001@{SYNTH_DOMAIN}")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--output", help="write results JSON here")
+    args = ap.parse_args(argv)
+
+    fx = load_fixture(args.tester_email)
+    token = create_token(fx["tester_id"], "tester")
+    results = []
+    for w in args.workers:
+        r = run_one(w, args, token, fx["project_ids"])
+        results.append(r)
+        print(f"workers={w:<3d} {r['throughput_rps']:9.1f} req/s  p50 {r['p50_ms']:8.2f}  "
+              f"p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms  err {r['errors']}  "
+              f"shutdown {r['shutdown_s']}s")
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"concurrency": args.concurrency, "duration": args.duration,
+                       "dataset": fx["dataset"], "results": results}, fh, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# backend/bench/partition_bench.py
+"""
+Partitioned vs unpartitioned `findings` at production scale (default 10M rows).
+
+Builds the same dataset twice, in schemas `bench_heap` (plain table) and
+`bench_part` (monthly RANGE partitions on created_at). Rows are generated
+server-side in time order, the way findings really arrive. It then times the
+app's own query helpers (listing, CSV export, summary) for the same random
+projects against both layouts, and counts the partitions each query touches.
+
+    python -m bench.partition_bench                      # load + measure
+    python -m bench.partition_bench --skip-load --runs 500
+    python -m bench.partition_bench --findings 1000000 --projects 2000   # quicker
+
+Loading 10M rows takes several minutes and ~2 x (description-size x rows) of disk.
+"""
+import argparse
+import csv
+import datetime
+import io
+import json
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.partitioning import ensure_partitions, prepare_schema
+from app.routers.tester import _all_project_findings, _project_summary
+from bench.api_bench import percentile
+
+LAYOUTS = {"heap": "bench_heap", "partitioned": "bench_part"}
+TESTER_ID = 1
+
+
+def _engine(schema: str):
+    # search_path makes the unqualified ORM tables resolve inside the bench schema. `public` must
+    # not be on it, or create_all would find the app's tables there and create nothing here.
+    return create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+
+
+def load(findings: int, projects: int, years: int, description_size: int):
+    per_project = max(1, findings // projects)
+    for layout, schema in LAYOUTS.items():
+        admin = create_engine(settings.DATABASE_URL)
+        with admin.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+            conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+        admin.dispose()
+
+        # The app's own schema setup, so every table its queries touch (findings_archive
+        # included) exists in both layouts
+        eng = _engine(schema)
+        enabled = settings.PARTITIONING_ENABLED
+        settings.PARTITIONING_ENABLED = layout == "partitioned"
+        try:
+            with eng.begin() as conn:
+                prepare_schema(conn)
+                if layout == "partitioned":
+                    start = datetime.date.today() - datetime.timedelta(days=365 * years + 31)
+                    ensure_partitions(conn, "findings", start=start)
+        finally:
+            settings.PARTITIONING_ENABLED = enabled
+        eng.dispose()
+
+    heap, part = LAYOUTS["heap"], LAYOUTS["partitioned"]
+    eng = create_engine(settings.DATABASE_URL)
+    t0 = time.perf_counter()
+    with eng.begin() as conn:
+        conn.execute(text("SELECT setseed(0.42)"))
+        for schema in (heap, part):
+            # create_all made a separate `role` enum type per schema; the types don't cast
+            # into each other, so users are inserted into each schema rather than copied
+            conn.execute(text(
+                f"INSERT INTO {schema}.users (id, email, password_hash, role) "
+                f"VALUES ({TESTER_ID}, 'bench@partition.local', 'x', 'tester')"
+            ))
+        conn.execute(text(
+            f"INSERT INTO {heap}.projects (id, client_name, title, status, created_at) "
+            f"SELECT g, 'Client ' || (g % 1000), 'Engagement ' || g, 'In Progress', "
+            f"timezone('utc', now()) - random() * interval '{years} years' "
+            f"FROM generate_series(1, :n) g"
+        ), {"n": projects})
+        # Time-ordered like real traffic: engagements interleave, each active ~3 months
+        conn.execute(text(
+            f"INSERT INTO {heap}.findings (project_id, tester_id, title, severity, description, status, created_at) "
+            f"SELECT project_id, {TESTER_ID}, title, severity, description, status, created_at FROM ("
+            f"  SELECT p.id AS project_id, 'Finding ' || g AS title, "
+            f"  (ARRAY['Critical','High','Medium','Low'])[1 + floor(random() * 4)::int] AS severity, "
+            f"  repeat('x', :desc) AS description, "
+            f"  (ARRAY['open','open','fixed'])[1 + floor(random() * 3)::int] AS status, "
+            f"  least(timezone('utc', now()), p.created_at + random() * interval '90 days') AS created_at "
+            f"  FROM {heap}.projects p CROSS JOIN generate_series(1, :per) g"
+            f") s ORDER BY created_at"
+        ), {"desc": description_size, "per": per_project})
+        for table in ("projects", "findings"):
+            conn.execute(text(f"INSERT INTO {part}.{table} SELECT * FROM {heap}.{table}"))
+        for schema in (heap, part):
+            conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{schema}.findings', 'id'), "
+                              f"(SELECT max(id) FROM {schema}.findings))"))
+    with eng.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for schema in (heap, part):
+            conn.execute(text(f"ANALYZE {schema}.projects"))
+            conn.execute(text(f"ANALYZE {schema}.findings"))
+    eng.dispose()
+    print(f"loaded {projects * per_project} findings x 2 layouts in {time.perf_counter() - t0:.1f}s")
+
+
+# The statements the findings list, CSV/XLSX exports and report generation run
+def _export_csv(db: Session, pid: int) -> int:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    for f in _all_project_findings(db, pid, TESTER_ID).all():
+        w.writerow([f.id, f.project_id, f.title, f.severity, f.status, f.description, f.poc_path])
+    return buf.tell()
+
+
+OPERATIONS: Dict[str, Callable[[Session, int], object]] = {
+    "listing": lambda db, pid: _all_project_findings(db, pid, TESTER_ID).all(),
+    "export": _export_csv,
+    "summary": lambda db, pid: _project_summary(db, pid, TESTER_ID),
+}
+
+
+def _partitions_scanned(db: Session, pid: int) -> int:
+    q = _all_project_findings(db, pid, TESTER_ID)
+    compiled = q.statement.compile(dialect=db.get_bind().dialect)
+    # The project-start bound is a subquery, so pruning happens at execution time: only
+    # EXPLAIN ANALYZE shows it (pruned partitions are "never executed", i.e. 0 loops)
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN (ANALYZE, FORMAT JSON) " + str(compiled), compiled.params).scalar()
+
+    def relations(node) -> List[str]:
+        found = [node["Relation Name"]] if "Relation Name" in node and node.get("Actual Loops", 1) else []
+        for child in node.get("Plans", []):
+            found += relations(child)
+        return found
+
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    # Only findings partitions; the plan also reads projects and findings_archive
+    return len({r for r in relations(plan[0]["Plan"]) if r.startswith("findings") and r != "findings_archive"})
+
+
+def measure(runs: int, seed: int) -> dict:
+    # Both layouts run the same statements, with the project-start bound the app adds when partitioned
+    settings.PARTITIONING_ENABLED = True
+    eng = create_engine(settings.DATABASE_URL)
+    with eng.connect() as conn:
+        max_pid = conn.execute(text(f"SELECT max(id) FROM {LAYOUTS['heap']}.projects")).scalar()
+        total = conn.execute(text(f"SELECT count(*) FROM {LAYOUTS['heap']}.findings")).scalar()
+    eng.dispose()
+    if not max_pid:
+        raise SystemExit("no benchmark data; run without --skip-load first")
+
+    pids = random.Random(seed).choices(range(1, max_pid + 1), k=runs)
+    results: Dict[str, dict] = {}
+    for layout, schema in LAYOUTS.items():
+        eng = _engine(schema)
+        results[layout] = {}
+        with Session(eng) as db:
+            for pid in pids[:10]:  # warm caches
+                for op in OPERATIONS.values():
+                    op(db, pid)
+            for name, op in OPERATIONS.items():
+                times = []
+                for pid in pids:
+                    t0 = time.perf_counter()
+                    op(db, pid)
+                    times.append(time.perf_counter() - t0)
+                    db.expunge_all()
+                times.sort()
+                results[layout][name] = {
+                    "p50_ms": round(percentile(times, 50) * 1000, 3),
+                    "p95_ms": round(percentile(times, 95) * 1000, 3),
+                    "p99_ms": round(percentile(times, 99) * 1000, 3),
+                    "mean_ms": round(statistics.mean(times) * 1000, 3),
+                }
+            results[layout]["partitions_scanned"] = _partitions_scanned(db, pids[0])
+        eng.dispose()
+
+    return {"findings": total, "projects": max_pid, "runs": runs, "layouts": results}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark partitioned vs heap findings")
+    ap.add_argument("--findings", type=int, default=10_000_000)
+    ap.add_argument("--projects", type=int, default=20_000)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--description-size", type=int, default=300)
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--skip-load", action="store_true")
+    ap.add_argument("--output", help="write results JSON here")
+    args = ap.parse_args(argv)
+
+    if not args.skip_load:
+        load(args.findings, args.projects, args.years, args.description_size)
+    result = measure(args.runs, args.seed)
+
+    for op in OPERATIONS:
+        h, p = result["layouts"]["heap"][op], result["layouts"]["partitioned"][op]
+        print(f"{op:8s} heap p50 {h['p50_ms']:8.2f} p95 {h['p95_ms']:8.2f} | "
+              f"partitioned p50 {p['p50_ms']:8.2f} p95 {p['p95_ms']:8.2f} ms")
+    print(f"partitions scanned per project query: {result['layouts']['partitioned']['partitions_scanned']}")
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(result, fh, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# backend/bench/startup_bench.py
+"""
+Cold-start benchmark. Each sample runs in a fresh interpreter so import
+caches don't hide anything:
+
+    python -m bench.startup_bench                # lazy exports (default app)
+    python -m bench.startup_bench --eager        # also import reportlab/openpyxl up front
+    python -m bench.startup_bench --warmup       # WARMUP_ON_STARTUP=true
+    python -m bench.startup_bench --no-db        # import only; skip the lifespan
+
+Reports median/min for `import app.main`, the lifespan startup and the sum.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_PROBE = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+if {eager}:
+    import app.services.report_service, app.services.excel_service
+import app.main
+t1 = time.perf_counter()
+lifespan_s = None
+if {lifespan}:
+    async def _start():
+        async with app.main.app.router.lifespan_context(app.main.app):
+            pass
+    asyncio.run(_start())
+    lifespan_s = time.perf_counter() - t1
+print(json.dumps({{"import_s": t1 - t0, "lifespan_s": lifespan_s,
+                  "reportlab_loaded": "reportlab" in sys.modules,
+                  "openpyxl_loaded": "openpyxl" in sys.modules}}))
+"""
+
+
+def _sample(eager: bool, lifespan: bool, env: dict) -> dict:
+    code = _PROBE.format(eager=eager, lifespan=lifespan)
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure app cold-start time")
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--eager", action="store_true", help="import export libraries before the app")
+    ap.add_argument("--warmup", action="store_true", help="enable WARMUP_ON_STARTUP")
+    ap.add_argument("--no-db", action="store_true", help="measure import only (no lifespan)")
+    ap.add_argument("--output", help="write results JSON here")
+    args = ap.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.warmup:
+        env["WARMUP_ON_STARTUP"] = "true"
+
+    samples = [_sample(args.eager, not args.no_db, env) for _ in range(args.runs)]
+
+    def summarize(key):
+        values = [s[key] for s in samples if s[key] is not None]
+        if not values:
+            return None
+        return {"median_ms": round(statistics.median(values) * 1000, 2),
+                "min_ms": round(min(values) * 1000, 2)}
+
+    for s in samples:
+        s["total_s"] = s["import_s"] + (s["lifespan_s"] or 0.0)
+    result = {
+        "runs": args.runs, "eager": args.eager, "warmup": args.warmup,
+        "import": summarize("import_s"),
+        "lifespan": summarize("lifespan_s"),
+        "total": summarize("total_s"),
+        "export_libs_loaded_at_startup": samples[0]["reportlab_loaded"] or samples[0]["openpyxl_loaded"],
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(result, fh, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# backend/gunicorn.conf.py
+# Production serving profile, driven by app.core.config.Settings (.env / env vars):
+#
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# Each worker is a uvicorn event loop with its own DB pool; see
+# app/core/serving.py for how the pool is sized against max_connections.
+import shutil
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.metrics import mark_process_dead
+from app.core.serving import worker_count, db_pool_budget, use_worker_budget
+
+# Size each worker's DB pool from the shared budget (workers import app.core.db after fork)
+use_worker_budget()
+
+bind = settings.WEB_BIND
+workers = worker_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = settings.WEB_TIMEOUT
+graceful_timeout = settings.GRACEFUL_TIMEOUT
+keepalive = settings.WEB_KEEPALIVE
+max_requests = settings.WEB_MAX_REQUESTS
+max_requests_jitter = settings.WEB_MAX_REQUESTS_JITTER
+# Import the app in each worker after fork: engines/pools must not be shared across processes
+preload_app = False
+accesslog = "-"
+
+
+def on_starting(server):
+    # Fresh metrics per deployment; stale snapshots from old PIDs would be summed forever
+    if settings.METRICS_DIR:
+        shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
+        Path(settings.METRICS_DIR).mkdir(parents=True, exist_ok=True)
+    budget = db_pool_budget()
+    server.log.info(
+        "serving with %d worker(s) x %d instance(s); DB pool per worker: %d + %d overflow (max_connections=%d)",
+        workers, settings.INSTANCE_COUNT, budget["pool_size"], budget["max_overflow"],
+        settings.DB_MAX_CONNECTIONS,
+    )
+
+
+def child_exit(server, worker):
+    # Recycled workers (WEB_MAX_REQUESTS) would otherwise leave a snapshot file each
+    mark_process_dead(worker.pid)
@@ -0,0 +1,218 @@
+# backend/tests/test_archive_service.py
+import asyncio
+import datetime
+import gzip
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.models.models import (
+    Base, Project, Assignment, Client, Report, ReportArchive, Finding, FindingArchive,
+)
+from app.routers import tester
+from app.routers.tester import _all_project_findings, _project_summary
+from app.services.archive_service import archive_reports, archive_findings, open_archived
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _add_reports(db, tmp_path, project_id, count, shared_path=None):
+    start = datetime.datetime(2026, 1, 1)
+    ids = []
+    for k in range(count):
+        path = shared_path or tmp_path / f"report_proj{project_id}_{k}.pdf"
+        path.write_bytes(f"%PDF report {project_id}/{k}".encode())
+        r = Report(project_id=project_id, tester_id=1, file_path=str(path), summary=f"Findings: {k}",
+                   created_at=start + datetime.timedelta(days=k))
+        db.add(r)
+        db.flush()
+        ids.append(r.id)
+    db.commit()
+    return ids
+
+
+def test_archive_reports_keeps_newest_per_project(db, tmp_path):
+    db.add_all([Project(id=1, client_name="A", title="a"), Project(id=2, client_name="B", title="b")])
+    first = _add_reports(db, tmp_path, 1, 5)
+    second = _add_reports(db, tmp_path, 2, 2)
+
+    assert archive_reports(db, keep=2) == 3
+
+    assert sorted(r.id for r in db.query(Report)) == sorted(first[-2:] + second)
+    archived = {a.id: a for a in db.query(ReportArchive)}
+    assert sorted(archived) == first[:3]
+    for rid in first[:3]:
+        a = archived[rid]
+        assert a.project_id == 1 and a.summary == f"Findings: {first.index(rid)}"
+        assert b"".join(open_archived(a.file_path)) == f"%PDF report 1/{first.index(rid)}".encode()
+        # the hot copy is gone once it is no longer referenced
+        assert not (tmp_path / f"report_proj1_{first.index(rid)}.pdf").exists()
+
+    # Idempotent: nothing left to move
+    assert archive_reports(db, keep=2) == 0
+
+
+def test_archive_reports_compresses_shared_file_once(db, tmp_path):
+    db.add(Project(id=1, client_name="A", title="a"))
+    shared = tmp_path / "report_proj1.pdf"
+    _add_reports(db, tmp_path, 1, 3, shared_path=shared)
+
+    assert archive_reports(db, project_id=1, keep=0) == 3
+    assert {a.file_path for a in db.query(ReportArchive)} == {
+        str(tmp_path / "archive" / "reports" / "proj1" / "1_report_proj1.pdf.gz")}
+    assert not shared.exists()
+
+
+def test_archive_reports_keeps_file_shared_with_hot_row(db, tmp_path):
+    db.add(Project(id=1, client_name="A", title="a"))
+    shared = tmp_path / "report_proj1_tester1.pdf"
+    _add_reports(db, tmp_path, 1, 3, shared_path=shared)
+
+    assert archive_reports(db, project_id=1, keep=1) == 2
+    assert shared.exists()
+    assert db.query(ReportArchive).count() == 2
+
+
+def test_archive_findings_moves_finished_projects_only(db, tmp_path):
+    long_ago = datetime.date.today() - datetime.timedelta(days=400)
+    db.add_all([
+        Project(id=1, client_name="A", title="done", status="Completed", due_date=long_ago),
+        Project(id=2, client_name="B", title="running", status="In Progress", due_date=long_ago),
+    ])
+    poc = tmp_path / "poc_1_shot.png"
+    poc.write_bytes(b"png bytes")
+    db.add_all([
+        Finding(project_id=1, tester_id=1, title="SQLi", severity="Critical", poc_path=str(poc)),
+        Finding(project_id=1, tester_id=1, title="XSS", severity="High"),
+        Finding(project_id=2, tester_id=1, title="IDOR", severity="Medium"),
+    ])
+    db.commit()
+
+    assert archive_findings(db, older_than_days=180) == 2
+
+    assert [f.title for f in db.query(Finding)] == ["IDOR"]
+    archived = {f.title: f for f in db.query(FindingArchive)}
+    assert set(archived) == {"SQLi", "XSS"}
+    assert gzip.open(archived["SQLi"].poc_path).read() == b"png bytes"
+    assert archived["XSS"].poc_path is None
+    assert not poc.exists()
+
+
+def test_reports_and_exports_include_archived_findings(db):
+    long_ago = datetime.date.today() - datetime.timedelta(days=400)
+    db.add(Project(id=1, client_name="A", title="done", status="Completed", due_date=long_ago))
+    db.add_all([
+        Finding(project_id=1, tester_id=1, title="SQLi", severity="Critical"),
+        Finding(project_id=1, tester_id=1, title="XSS", severity="High"),
+    ])
+    db.commit()
+    archive_findings(db, older_than_days=180)
+    db.add(Finding(project_id=1, tester_id=1, title="Late", severity="Low"))
+    db.commit()
+
+    rows = _all_project_findings(db, 1, 1).all()
+    # SQLite may reuse a moved row's id, so don't rely on the id order here
+    assert sorted(r.title for r in rows) == ["Late", "SQLi", "XSS"]
+    assert [r.id for r in rows] == sorted((r.id for r in rows), reverse=True)
+    assert _project_summary(db, 1, 1) == "Findings: 3 (Critical: 1, High: 1)"
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """The tester router on SQLite, with auth skipped and a fake PDF renderer."""
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(settings, "SKIP_AUTH", True)
+    monkeypatch.setattr(settings, "DEV_ASSUME_TESTER_ID", 1)
+    monkeypatch.setattr(settings, "PARTITIONING_ENABLED", False)
+    monkeypatch.setattr(tester, "uploads_dir", tmp_path / "uploads")
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(tester, "SessionLocal", sessionmaker(bind=engine))
+
+    def fake_pdf(dest_path, project_id, tester_id, summary, findings):
+        dest_path.write_text(f"{summary} | " + ", ".join(f["title"] for f in findings))
+        return dest_path
+    monkeypatch.setattr(tester, "generate_report_pdf", fake_pdf)
+
+    with Session(engine) as session:
+        long_ago = datetime.date.today() - datetime.timedelta(days=400)
+        session.add_all([
+            Client(name="Acme"),
+            Project(id=1, client_name="Acme", title="done", status="Completed", due_date=long_ago),
+            Assignment(project_id=1, tester_id=1),
+        ])
+        session.commit()
+
+    app = FastAPI()
+    app.include_router(tester.router)
+
+    def call(method, url, **kwargs):
+        async def go():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as c:
+                resp = await c.request(method, url, **kwargs)
+                assert resp.status_code == 200, resp.text
+                return resp.json()
+        return asyncio.run(go())
+
+    yield engine, call
+    engine.dispose()
+
+
+def test_archived_reports_keep_their_own_pdf(api, monkeypatch):
+    engine, call = api
+    monkeypatch.setattr(settings, "ARCHIVE_ON_WRITE", True)
+    monkeypatch.setattr(settings, "REPORTS_KEEP_HOT", 1)
+    with Session(engine) as s:
+        s.add(Finding(project_id=1, tester_id=1, title="SQLi", severity="Critical"))
+        s.commit()
+    first = call("POST", "/tester/reports/generate", params={"project_id": 1})["report_id"]
+    with Session(engine) as s:
+        s.add(Finding(project_id=1, tester_id=1, title="XSS", severity="High"))
+        s.commit()
+    second = call("POST", "/tester/reports/generate", params={"project_id": 1})["report_id"]
+
+    with Session(engine) as s:
+        assert [r.id for r in s.query(Report)] == [second]
+        archived = s.get(ReportArchive, first)
+        hot = s.get(Report, second)
+        old_pdf = b"".join(open_archived(archived.file_path)).decode()
+        new_pdf = open(hot.file_path).read()
+    assert old_pdf.endswith("| SQLi")
+    assert new_pdf.endswith("| XSS, SQLi")
+
+
+def test_archived_findings_count_everywhere(api):
+    engine, call = api
+    with Session(engine) as s:
+        s.add_all([
+            Finding(project_id=1, tester_id=1, title="SQLi", severity="Critical", status="open"),
+            Finding(project_id=1, tester_id=1, title="XSS", severity="High", status="fixed"),
+        ])
+        s.commit()
+        assert archive_findings(s, older_than_days=180) == 2
+        s.add(Finding(project_id=1, tester_id=1, title="Late", severity="Low", status="open"))
+        s.commit()
+
+    listed = call("GET", "/tester/findings/list", params={"project_id": 1})
+    assert sorted(f["title"] for f in listed) == ["Late", "SQLi", "XSS"]
+    assert sorted(f["title"] for f in listed if f.get("archived")) == ["SQLi", "XSS"]
+    hot_only = call("GET", "/tester/findings/list", params={"project_id": 1, "include_archived": False})
+    assert [f["title"] for f in hot_only] == ["Late"]
+
+    [client] = call("GET", "/tester/clients")
+    assert client["open_findings"] == 2
+    profile = call("GET", f"/tester/clients/{client['client_id']}")
+    assert profile["stats"]["open_findings"] == 2
@@ -0,0 +1,80 @@
+# backend/tests/test_draining.py
+import signal
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.draining import InFlight
+
+
+def test_track_refuses_new_work_once_draining():
+    f = InFlight()
+    with f.track("report"):
+        assert f.active() == {"report": 1}
+    assert f.active() == {}
+    f.start_draining()
+    with pytest.raises(HTTPException) as exc:
+        with f.track("report"):
+            pass
+    assert exc.value.status_code == 503 and exc.value.headers["Retry-After"] == "5"
+
+
+def test_drain_waits_for_running_jobs():
+    f = InFlight()
+    started = threading.Event()
+
+    def job():
+        with f.track("report"):
+            started.set()
+            time.sleep(0.2)
+
+    t = threading.Thread(target=job)
+    t.start()
+    started.wait()
+    assert f.drain(5) is True
+    assert f.active() == {}
+    t.join()
+
+
+def test_drain_deadline_counts_from_start_draining():
+    f = InFlight()
+    f.start_draining()
+    time.sleep(0.2)
+    with f._cond:
+        f._active["report"] = 1   # a job that never finishes
+    t0 = time.monotonic()
+    assert f.drain(0.5) is False
+    assert time.monotonic() - t0 < 0.45
+
+
+@pytest.fixture
+def restore_signals():
+    saved = {s: signal.getsignal(s) for s in (signal.SIGTERM, signal.SIGINT)}
+    yield
+    for s, h in saved.items():
+        signal.signal(s, h)
+
+
+def test_signal_starts_draining_and_delays_server_exit(restore_signals):
+    calls = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: calls.append(signum))
+    f = InFlight()
+    f.install_signal_handlers(delay=0.2)
+
+    signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+    assert f.draining and calls == []
+    time.sleep(0.4)
+    assert calls == [signal.SIGTERM]
+
+
+def test_second_signal_is_passed_on_immediately(restore_signals):
+    calls = []
+    signal.signal(signal.SIGINT, lambda signum, frame: calls.append(signum))
+    f = InFlight()
+    f.install_signal_handlers(delay=5)
+    handler = signal.getsignal(signal.SIGINT)
+    handler(signal.SIGINT, None)
+    handler(signal.SIGINT, None)
+    assert calls == [signal.SIGINT]
@@ -0,0 +1,121 @@
+# backend/tests/test_metrics.py
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.metrics import (
+    AGGREGATE_FILE, LATENCY_BUCKETS, MetricsMiddleware, RequestStats, _Histogram, _Registry,
+    install_db_hooks, mark_process_dead, registry, render_all,
+)
+
+
+def test_histogram_buckets_are_upper_inclusive():
+    h = _Histogram((1, 5, 10))
+    for v in (0.5, 1, 3, 10, 11):
+        h.observe(v)
+    assert h.counts == [2, 1, 1, 1]   # le=1, le=5, le=10, +Inf
+    assert h.count == 5 and h.sum == 25.5
+
+
+def test_render_is_cumulative_and_escapes_labels():
+    reg = _Registry()
+    stats = RequestStats()
+    stats.queries, stats.db_time, stats.rows = 3, 0.002, 7
+    reg.record_request("GET", '/a/"x"', 200, 0.02, stats)
+    reg.record_request("GET", '/a/"x"', 200, 0.3, stats)
+    out = reg.render()
+
+    labels = 'method="GET",route="/a/\\"x\\"",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in out
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in out
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 2' in out
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in out
+    assert f"http_request_duration_seconds_count{{{labels}}} 2" in out
+    assert 'db_rows_total{method="GET",route="/a/\\"x\\""} 14' in out
+    assert out.endswith("\n")
+
+
+def test_merge_adds_snapshots():
+    a, b = _Registry(), _Registry()
+    a.record_request("GET", "/x", 200, 0.01, RequestStats())
+    b.record_request("GET", "/x", 200, 0.01, RequestStats())
+    b.record_slow_query()
+    total = _Registry()
+    total.merge(a.snapshot())
+    total.merge(b.snapshot())
+    h = total.latency[("GET", "/x", "200")]
+    assert h.count == 2 and len(h.counts) == len(LATENCY_BUCKETS) + 1
+    assert total.slow_queries == 1
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://")
+    install_db_hooks(eng)
+    yield eng
+    eng.dispose()
+
+
+def test_failed_statement_does_not_leak_start_time(engine):
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("query_start") == []
+
+
+def test_n_plus_one_detection(engine, monkeypatch):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 5)
+    registry.reset()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def items(item_id: int, repeat: int):
+        with engine.connect() as conn:
+            for i in range(repeat):
+                conn.execute(text(f"SELECT {i}"))
+        return {"ok": True}
+
+    async def call(repeat):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as c:
+            assert (await c.get(f"/items/1?repeat={repeat}")).status_code == 200
+
+    asyncio.run(call(4))
+    assert registry.n_plus_one == {}
+    # Literals are normalized, so SELECT 0..5 count as one statement
+    asyncio.run(call(6))
+    assert registry.n_plus_one == {("GET", "/items/{item_id}"): 1}
+    assert registry.queries[("GET", "/items/{item_id}")].count == 2
+    registry.reset()
+
+
+def test_dead_worker_snapshots_fold_into_aggregate(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path))
+    registry.reset()
+
+    def worker_snapshot(pid, slow):
+        reg = _Registry()
+        reg.record_request("GET", "/x", 200, 0.01, RequestStats())
+        for _ in range(slow):
+            reg.record_slow_query()
+        (tmp_path / f"{pid}.json").write_text(json.dumps(reg.snapshot()))
+
+    worker_snapshot(101, 1)
+    worker_snapshot(102, 2)
+    mark_process_dead(101)
+    mark_process_dead(102)
+    # A recycled worker reusing a PID starts from zero without erasing the old totals
+    worker_snapshot(101, 4)
+
+    assert sorted(f.name for f in tmp_path.glob("*.json")) == ["101.json", AGGREGATE_FILE]
+    out = render_all()
+    assert "db_slow_queries_total 7\n" in out
+    assert 'http_request_duration_seconds_count{method="GET",route="/x",status="200"} 3' in out
+    mark_process_dead(999)  # no snapshot: nothing to do
@@ -0,0 +1,49 @@
+# backend/tests/test_serving.py
+import pytest
+
+from app.core import serving
+from app.core.config import settings
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(serving, "_worker_budget", True)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", None)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", None)
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 100)
+    monkeypatch.setattr(settings, "DB_RESERVED_CONNECTIONS", 10)
+    monkeypatch.setattr(settings, "INSTANCE_COUNT", 1)
+    monkeypatch.setattr(settings, "WEB_WORKERS", 3)
+
+
+def test_budget_splits_connections_across_workers(budget):
+    assert serving.db_pool_budget() == {"pool_size": 18, "max_overflow": 12}   # 90 // 3 = 30
+
+
+def test_budget_counts_every_instance(budget, monkeypatch):
+    monkeypatch.setattr(settings, "INSTANCE_COUNT", 2)
+    b = serving.db_pool_budget()
+    assert b["pool_size"] + b["max_overflow"] == 15
+
+
+def test_budget_too_small_fails_loudly(budget, monkeypatch):
+    monkeypatch.setattr(settings, "WEB_WORKERS", 91)
+    with pytest.raises(RuntimeError):
+        serving.db_pool_budget()
+
+
+def test_explicit_pool_size_wins(budget, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 4)
+    assert serving.db_pool_budget() == {"pool_size": 4, "max_overflow": 0}
+
+
+def test_default_pool_outside_gunicorn(budget, monkeypatch):
+    monkeypatch.setattr(serving, "_worker_budget", False)
+    monkeypatch.setattr(settings, "WEB_WORKERS", 0)
+    assert serving.db_pool_budget() == {}
+
+
+def test_worker_count_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_WORKERS", 0)
+    monkeypatch.setattr(settings, "WEB_WORKERS_MAX", 2)
+    assert serving.worker_count() <= 2